@@ -0,0 +1,257 @@
+"""
+Admission control for the HTTP /mcp endpoint
+Per-client token buckets, a global in-flight limit with a bounded priority queue,
+and fast 429 rejection when saturated
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet
+
+from profiling import span
+
+# Priority lanes: lower value is served first
+LANE_CACHED = 0
+LANE_UPSTREAM = 1
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/second, up to `burst` tokens"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, cost: float = 1.0) -> float:
+        """Take `cost` tokens. Returns 0 on success, else seconds until enough tokens"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class ClientLimiter:
+    """Token bucket per client key, with LRU eviction of idle clients"""
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def check(self, key: str) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take()
+
+
+class AdmissionController:
+    """Global max-in-flight limit with a bounded, lane-ordered wait queue"""
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self._waiters: list = []
+        self._seq = itertools.count()
+
+    async def acquire(self, lane: int = LANE_UPSTREAM) -> None:
+        if self.in_flight < self.max_in_flight and not self.queued:
+            self.in_flight += 1
+            return
+
+        if self.queued >= self.max_queue:
+            raise Overloaded("Server is saturated", self.queue_timeout)
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane, next(self._seq), fut))
+        self.queued += 1
+        try:
+            # release() hands the slot over by resolving the future
+            await asyncio.wait_for(fut, self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise Overloaded("Timed out waiting for a slot", self.queue_timeout)
+        except BaseException:
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+        finally:
+            if not fut.done() or fut.cancelled():
+                self.queued -= 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            self.queued -= 1
+            self.in_flight += 1
+            fut.set_result(None)
+            return
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+        }
+
+
+def client_key(scope: Dict[str, Any], trusted_proxies: int = 1, client_keys: FrozenSet[str] = frozenset()) -> str:
+    """Identify a client by a configured API key, else by IP
+
+    Headers are client-controlled: an API key only counts if it is one of
+    `client_keys`, and of X-Forwarded-For only the hop appended by the
+    `trusted_proxies`-th proxy from the right is used (0: ignore the header).
+    """
+    headers = dict(scope.get("headers") or [])
+    api_key = (headers.get(b"x-api-key") or headers.get(b"authorization") or b"").decode("latin-1")
+    if api_key and api_key in client_keys:
+        return "key:" + api_key
+
+    forwarded = headers.get(b"x-forwarded-for")
+    if forwarded and trusted_proxies > 0:
+        hops = [hop.strip() for hop in forwarded.decode("latin-1").split(",") if hop.strip()]
+        if len(hops) >= trusted_proxies:
+            return "ip:" + hops[-trusted_proxies]
+
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that admits `tools/call` requests to POST /mcp
+
+    `classify(tool_name, arguments)` returns the priority lane for a call.
+    Other MCP methods (initialize, tools/list, ...) are cheap and pass straight through.
+    """
+
+    def __init__(
+        self,
+        app,
+        controller: AdmissionController,
+        limiter: ClientLimiter,
+        classify: Callable[[str, Dict], int],
+        path: str = "/mcp",
+        trusted_proxies: int = 1,
+        client_keys: FrozenSet[str] = frozenset(),
+    ):
+        self.app = app
+        self.controller = controller
+        self.limiter = limiter
+        self.classify = classify
+        self.path = path
+        self.trusted_proxies = trusted_proxies
+        self.client_keys = client_keys
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.path:
+            return await self.app(scope, receive, send)
+
+        # Buffer the body so it can be inspected and then replayed downstream
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict) or payload.get("method") != "tools/call":
+            return await self.app(scope, replay, send)
+
+        params = payload.get("params")
+        if not isinstance(params, dict):
+            params = {}
+        request_id = payload.get("id")
+
+        wait = self.limiter.check(client_key(scope, self.trusted_proxies, self.client_keys))
+        if wait:
+            return await self._reject(send, request_id, Overloaded("Client rate limit exceeded", wait))
+
+        lane = self._lane(params)
+        try:
+            with span("queue"):
+                await self.controller.acquire(lane)
+        except Overloaded as e:
+            return await self._reject(send, request_id, e)
+
+        try:
+            await self.app(scope, replay, send)
+        finally:
+            self.controller.release()
+
+    def _lane(self, params: Dict) -> int:
+        """Lane for a call; malformed params are left for the endpoint to report"""
+        arguments = params.get("arguments")
+        try:
+            return self.classify(params.get("name"), arguments if isinstance(arguments, dict) else {})
+        except Exception:
+            return LANE_UPSTREAM
+
+    async def _reject(self, send, request_id: Any, error: Overloaded) -> None:
+        retry_after = max(1, math.ceil(error.retry_after))
+        body = json.dumps({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {
+                "code": -32000,
+                "message": error.reason,
+                "data": {"retryAfter": retry_after},
+            },
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,284 @@
+"""
+Weekly Soccer MCP benchmarks
+
+    python bench.py startup [--runs N] [--budget-ms MS] [--import-budget-ms MS]
+    python bench.py memory [--live]
+
+startup: time from spawning server_stdio.py to its first tools/list response,
+plus `python -X importtime` totals for the imports done before that response
+(server_stdio answers initialize / tools/list while mcp loads) and for
+everything imported before tool calls are served. Exits non-zero when the
+tools/list latency or the first-response import time exceeds its budget
+(0 disables a budget).
+
+memory: tracemalloc size of one league's cached upstream payloads (recent and
+upcoming matches, standings, teams, scorers), raw vs projected on ingest.
+Uses synthetic payloads shaped like the v4 API, or real ones with --live.
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STDIO_SERVER = os.path.join(HERE, "server_stdio.py")
+
+STARTUP_MESSAGES = [
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "bench", "version": "0"},
+        },
+    },
+    {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+]
+
+
+def time_to_tools_list() -> float:
+    """Seconds from process spawn until the tools/list response arrives"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, STDIO_SERVER],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        cwd=HERE,
+    )
+    try:
+        payload = "".join(json.dumps(m) + "\n" for m in STARTUP_MESSAGES)
+        proc.stdin.write(payload.encode())
+        proc.stdin.flush()
+        for line in proc.stdout:
+            message = json.loads(line)
+            if message.get("id") == 2:
+                if "result" not in message:
+                    raise RuntimeError(f"tools/list failed: {message}")
+                return time.perf_counter() - start
+        raise RuntimeError("server exited before answering tools/list")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+# Imported by server_stdio.main() before it answers initialize / tools/list
+FIRST_RESPONSE_IMPORTS = ["server_stdio", "profiling", "tempfile"]
+# Also imported (in a background thread) before the first tool call is served
+SERVER_IMPORTS = FIRST_RESPONSE_IMPORTS + [
+    "players", "football_api", "mcp.server", "mcp.server.models", "mcp.types", "mcp.shared.message", "anyio",
+]
+
+
+def import_time_ms(modules: list) -> float:
+    """Cumulative `-X importtime` of `modules` in a fresh interpreter"""
+    code = "import " + ", ".join(modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=HERE,
+        check=True,
+    )
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # top-level imports only; nested ones are included
+            total_us += int(cumulative)
+    return total_us / 1000
+
+
+def bench_startup(runs: int, budget_ms: float, import_budget_ms: float) -> int:
+    import_time_ms(SERVER_IMPORTS)  # warm the bytecode cache
+    imports = import_time_ms(FIRST_RESPONSE_IMPORTS)
+    server_imports = import_time_ms(SERVER_IMPORTS)
+    samples = [time_to_tools_list() * 1000 for _ in range(runs)]
+    startup = statistics.median(samples)
+
+    print(f"import time:         {imports:8.1f} ms before first response"
+          f" ({server_imports:.1f} ms before tool calls)")
+    print(f"spawn -> tools/list: {startup:8.1f} ms median"
+          f" (min {min(samples):.1f}, max {max(samples):.1f}, runs {runs})")
+
+    status = 0
+    if import_budget_ms and imports > import_budget_ms:
+        print(f"❌ import time over budget ({import_budget_ms:.0f} ms)")
+        status = 1
+    if budget_ms and startup > budget_ms:
+        print(f"❌ spawn -> tools/list over budget ({budget_ms:.0f} ms)")
+        status = 1
+    return status
+
+
+def _synthetic_team(i: int, squad: bool = False) -> dict:
+    team = {
+        "id": 60 + i,
+        "name": f"Football Club Number {i} FC",
+        "shortName": f"Club {i}",
+        "tla": f"C{i:02d}",
+        "crest": f"https://crests.football-data.org/{60 + i}.png",
+    }
+    if squad:
+        team.update({
+            "area": {"id": 2072, "name": "England", "code": "ENG", "flag": "https://crests.football-data.org/770.svg"},
+            "address": f"{i} Stadium Road London N{i} 1AA",
+            "website": f"http://www.club{i}.com",
+            "founded": 1880 + i,
+            "clubColors": "Red / White",
+            "venue": f"Club {i} Stadium",
+            "runningCompetitions": [
+                {"id": 2021, "name": "Premier League", "code": "PL", "type": "LEAGUE", "emblem": "https://crests.football-data.org/PL.png"},
+                {"id": 2001, "name": "UEFA Champions League", "code": "CL", "type": "CUP", "emblem": "https://crests.football-data.org/CL.png"},
+            ],
+            "coach": {"id": 9000 + i, "firstName": "Coach", "lastName": f"Number{i}", "name": f"Coach Number{i}",
+                      "dateOfBirth": "1970-01-01", "nationality": "Spain", "contract": {"start": "2023-07", "until": "2027-06"}},
+            "squad": [
+                {"id": i * 100 + n, "name": f"Player {n} of Club {i}", "position": "Midfield",
+                 "dateOfBirth": "1998-05-17", "nationality": "England"}
+                for n in range(30)
+            ],
+            "staff": [],
+            "lastUpdated": "2025-10-01T08:00:00Z",
+        })
+    return team
+
+
+def _synthetic_match(i: int, status: str) -> dict:
+    return {
+        "area": {"id": 2072, "name": "England", "code": "ENG", "flag": "https://crests.football-data.org/770.svg"},
+        "competition": {"id": 2021, "name": "Premier League", "code": "PL", "type": "LEAGUE",
+                        "emblem": "https://crests.football-data.org/PL.png"},
+        "season": {"id": 2287, "startDate": "2025-08-15", "endDate": "2026-05-24", "currentMatchday": 8, "winner": None},
+        "id": 500000 + i,
+        "utcDate": f"2025-10-{10 + i % 9:02d}T14:00:00Z",
+        "status": status,
+        "matchday": 8,
+        "stage": "REGULAR_SEASON",
+        "group": None,
+        "lastUpdated": "2025-10-18T20:00:00Z",
+        "homeTeam": _synthetic_team(2 * i % 20),
+        "awayTeam": _synthetic_team((2 * i + 1) % 20),
+        "score": {"winner": "HOME_TEAM", "duration": "REGULAR",
+                  "fullTime": {"home": 2, "away": 1}, "halfTime": {"home": 1, "away": 0}},
+        "odds": {"msg": "Activate Odds-Package in User-Panel to retrieve odds."},
+        "referees": [{"id": 11000 + i, "name": f"Referee {i}", "type": "REFEREE", "nationality": "England"}],
+    }
+
+
+def synthetic_payloads() -> dict:
+    """One league's worth of cached endpoints, shaped like the v4 API"""
+    standing_row = lambda i: {
+        "position": i + 1, "team": _synthetic_team(i), "playedGames": 8, "form": "W,W,D,L,W",
+        "won": 5, "draw": 1, "lost": 2, "points": 16, "goalsFor": 15, "goalsAgainst": 9, "goalDifference": 6,
+    }
+    return {
+        "/competitions/PL/matches?recent": {"resultSet": {"count": 10}, "filters": {}, "matches": [_synthetic_match(i, "FINISHED") for i in range(10)]},
+        "/competitions/PL/matches?upcoming": {"resultSet": {"count": 10}, "filters": {}, "matches": [_synthetic_match(i + 10, "TIMED") for i in range(10)]},
+        "/competitions/PL/standings": {
+            "filters": {}, "area": {}, "competition": {}, "season": {},
+            "standings": [{"stage": "REGULAR_SEASON", "type": t, "group": None, "table": [standing_row(i) for i in range(20)]}
+                          for t in ("TOTAL", "HOME", "AWAY")],
+        },
+        "/competitions/PL/teams": {"count": 20, "filters": {}, "competition": {}, "season": {},
+                                   "teams": [_synthetic_team(i, squad=True) for i in range(20)]},
+        "/competitions/PL/scorers?limit=50": {
+            "count": 50, "filters": {}, "competition": {}, "season": {},
+            "scorers": [
+                {"player": {"id": i, "name": f"Player {i}", "firstName": "Player", "lastName": str(i), "dateOfBirth": "1998-05-17",
+                            "nationality": "England", "section": "Offence", "position": None, "shirtNumber": 9,
+                            "lastUpdated": "2025-10-01T08:00:00Z"},
+                 "team": _synthetic_team(i % 20), "playedMatches": 8, "goals": 20 - i // 3, "assists": 3, "penalties": 1}
+                for i in range(50)
+            ],
+        },
+    }
+
+
+def live_payloads(league_code: str) -> dict:
+    """One league's cached endpoints fetched from the API (needs FOOTBALL_API_KEY)"""
+    import httpx
+
+    from football_api import API_BASE, HEADERS, recent_matches_endpoint, upcoming_matches_endpoint
+
+    endpoints = [
+        recent_matches_endpoint(league_code),
+        upcoming_matches_endpoint(league_code),
+        f"/competitions/{league_code}/standings",
+        f"/competitions/{league_code}/teams",
+        f"/competitions/{league_code}/scorers?limit=50",
+    ]
+    payloads = {}
+    for endpoint in endpoints:
+        response = httpx.get(f"{API_BASE}{endpoint}", headers=HEADERS, timeout=10.0)
+        response.raise_for_status()
+        payloads[endpoint] = response.json()
+        time.sleep(6)  # free tier: 10 requests/minute
+    return payloads
+
+
+def retained_bytes(build) -> int:
+    """Bytes still allocated after build() returns, while its result is alive"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_memory(live: bool, league_code: str) -> int:
+    from ingest import project
+
+    payloads = live_payloads(league_code) if live else synthetic_payloads()
+    raw = {endpoint: json.dumps(data).encode() for endpoint, data in payloads.items()}
+
+    print(f"{'endpoint':44} {'raw KB':>9} {'projected KB':>13} {'ratio':>6}")
+    total_raw = total_projected = 0
+    for endpoint, body in raw.items():
+        before = retained_bytes(lambda: json.loads(body))
+        after = retained_bytes(lambda: project(endpoint, json.loads(body)))
+        total_raw += before
+        total_projected += after
+        print(f"{endpoint[:44]:44} {before / 1024:9.1f} {after / 1024:13.1f} {before / max(after, 1):5.1f}x")
+
+    print(f"{'per league':44} {total_raw / 1024:9.1f} {total_projected / 1024:13.1f} {total_raw / max(total_projected, 1):5.1f}x")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    startup = sub.add_parser("startup", help="stdio cold start")
+    startup.add_argument("--runs", type=int, default=10)
+    # Defaults: measured ~75 ms for both; loading mcp before answering (~500 ms) fails them
+    startup.add_argument("--budget-ms", type=float, default=float(os.environ.get("STARTUP_BUDGET_MS", 200)))
+    startup.add_argument("--import-budget-ms", type=float, default=float(os.environ.get("IMPORT_BUDGET_MS", 150)))
+
+    memory = sub.add_parser("memory", help="cached payload size, raw vs projected")
+    memory.add_argument("--live", action="store_true", help="fetch real payloads (uses FOOTBALL_API_KEY)")
+    memory.add_argument("--league", default="PL", help="competition code for --live")
+
+    args = parser.parse_args()
+    if args.command == "startup":
+        return bench_startup(args.runs, args.budget_ms, args.import_budget_ms)
+    if args.command == "memory":
+        return bench_memory(args.live, args.league)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Versioned change log over cached upstream data
+Every fresh upstream response is diffed against what was last seen at the same
+endpoint; each match or standings row whose state changed there gets a new
+version. Clients poll with the opaque cursor from their previous result and
+receive only what changed since.
+
+Versions are kept per endpoint because endpoints overlap (the recent and
+upcoming windows and the fixture index all contain today's matches) and each
+expires on its own schedule: a result rendered from one endpoint's cached copy
+must only be compared with versions that copy has seen.
+"""
+import os
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+class ChangeLog:
+    """Last-seen state and change version per (endpoint, match / standings row)"""
+
+    def __init__(self, max_entries: int = 20000):
+        self.max_entries = max_entries
+        self.version = 0
+        # Cursors from another process (e.g. before a restart) must not be trusted
+        self.epoch = os.urandom(4).hex()
+        self._entries: "OrderedDict[Hashable, Tuple[int, Tuple]]" = OrderedDict()
+
+    def _observe(self, key: Hashable, state: Tuple) -> None:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] != state:
+            self.version += 1
+            self._entries[key] = (self.version, state)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _version(self, key: Hashable) -> int:
+        entry = self._entries.get(key)
+        # Unknown (never seen or evicted): report it as changed
+        return entry[0] if entry else self.version
+
+    def record(self, endpoint: str, data: Dict) -> None:
+        """Diff a fresh (projected) upstream response against the endpoint's last-seen state"""
+        for match in data.get("matches") or []:
+            full_time = match.get("score", {}).get("fullTime", {})
+            self._observe(
+                (endpoint, "match", match.get("id")),
+                (match.get("status"), match.get("utcDate"), full_time.get("home"), full_time.get("away")),
+            )
+
+        for standing in (data.get("standings") or [])[:1]:
+            for row in standing.get("table", []):
+                self._observe(
+                    (endpoint, "standing", row.get("team", {}).get("id")),
+                    (row.get("position"), row.get("points"), row.get("playedGames"), row.get("goalDifference")),
+                )
+
+    def match_version(self, endpoint: str, match: Dict) -> int:
+        return self._version((endpoint, "match", match.get("id")))
+
+    def standing_version(self, endpoint: str, row: Dict) -> int:
+        return self._version((endpoint, "standing", row.get("team", {}).get("id")))
+
+    def latest(self, endpoint: str, data: Dict) -> int:
+        """Newest version among the matches / standings rows of one endpoint's (projected) response"""
+        versions = [self.match_version(endpoint, match) for match in data.get("matches") or []]
+        for standing in (data.get("standings") or [])[:1]:
+            versions.extend(self.standing_version(endpoint, row) for row in standing.get("table", []))
+        return max(versions, default=0)
+
+    def cursor(self, version: int) -> str:
+        """Opaque token for a version"""
+        return f"{self.epoch}-{version}"
+
+    def parse_cursor(self, cursor: str) -> Optional[int]:
+        """Version encoded in a cursor from this process, or None if unknown/expired"""
+        epoch, _, version = (cursor or "").strip().partition("-")
+        if epoch != self.epoch or not version.isdigit():
+            return None
+        return int(version)
@@ -0,0 +1,109 @@
+"""
+Negotiated response compression (zstd / br / gzip)
+Brotli and Zstandard are used only when their packages are installed.
+"""
+import gzip
+from typing import Callable, Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    available = {}
+    if zstandard is not None:
+        available["zstd"] = lambda body: zstandard.ZstdCompressor(level=3).compress(body)
+    if brotli is not None:
+        available["br"] = lambda body: brotli.compress(body, quality=4)
+    available["gzip"] = lambda body: gzip.compress(body, compresslevel=6)
+    return available
+
+
+# Server preference order: first entry the client accepts wins
+COMPRESSORS = _compressors()
+
+
+def choose_encoding(accept_encoding: str, supported: List[str]) -> Optional[str]:
+    """Pick the supported encoding the client prefers (q > 0), or None"""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+
+    # Highest client q-value wins; server preference breaks ties
+    ranked = [(accepted.get(encoding, accepted.get("*", 0.0)), -i, encoding) for i, encoding in enumerate(supported)]
+    q, _, encoding = max(ranked)
+    return encoding if q > 0 else None
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing single-body responses above `minimum_size` bytes
+
+    Streamed responses (more than one body message) pass through untouched so
+    their sections still reach the client as soon as they are written.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"), list(COMPRESSORS))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                return await send(message)
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                return await send(message)
+
+            body = message.get("body", b"")
+            response_headers = [(k, v) for k, v in start_message["headers"]]
+            already_encoded = any(k.lower() == b"content-encoding" for k, _ in response_headers)
+
+            if message.get("more_body", False) or already_encoded or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start_message)
+                return await send(message)
+
+            compressed = COMPRESSORS[encoding](body)
+            vary = [v for k, v in response_headers if k.lower() == b"vary"]
+            response_headers = [(k, v) for k, v in response_headers if k.lower() not in (b"content-length", b"vary")]
+            response_headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", b", ".join(vary + [b"Accept-Encoding"])),
+            ]
+            await send({**start_message, "headers": response_headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, compressing_send)
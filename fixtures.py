@@ -0,0 +1,93 @@
+"""
+Time-zone aware fixture index
+Each kickoff is parsed once into an epoch int, and matches are bucketed per
+time zone by local day so "today's matches in KST" is a dict lookup.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+DEFAULT_TIMEZONES = ["Asia/Seoul", "UTC"]
+
+
+class Fixture(NamedTuple):
+    """Compact match record kept by the index"""
+    id: int
+    kickoff: int  # epoch seconds
+    league: str  # competition code, e.g. "PL"
+    home: str
+    away: str
+    status: str
+    home_score: Optional[int]
+    away_score: Optional[int]
+
+
+# (local "HH:MM", fixture), sorted by kickoff
+DayBucket = List[Tuple[str, Fixture]]
+
+
+def parse_fixture(match: Dict) -> Optional[Fixture]:
+    """Build a Fixture from an upstream match object"""
+    try:
+        kickoff = datetime.fromisoformat(match["utcDate"].replace("Z", "+00:00"))
+    except (KeyError, ValueError, AttributeError):
+        return None
+    full_time = match.get("score", {}).get("fullTime", {})
+    return Fixture(
+        id=match.get("id", 0),
+        kickoff=int(kickoff.timestamp()),
+        league=match.get("competition", {}).get("code", ""),
+        home=match.get("homeTeam", {}).get("name") or "Unknown",
+        away=match.get("awayTeam", {}).get("name") or "Unknown",
+        status=match.get("status", "SCHEDULED"),
+        home_score=full_time.get("home"),
+        away_score=full_time.get("away"),
+    )
+
+
+class FixtureIndex:
+    """Fixtures with precomputed per-timezone day buckets"""
+
+    def __init__(self, timezones: Iterable[str] = DEFAULT_TIMEZONES):
+        self.zones = {name: ZoneInfo(name) for name in timezones}
+        self.fixtures: List[Fixture] = []
+        self.days: Dict[str, Dict[str, DayBucket]] = {name: {} for name in self.zones}
+        self.updated = 0.0
+
+    def load(self, matches: Iterable[Dict]) -> None:
+        """Replace the index contents with `matches` (upstream match objects)"""
+        by_id: Dict[int, Fixture] = {}
+        for match in matches:
+            fixture = parse_fixture(match)
+            if fixture:
+                by_id[fixture.id] = fixture
+        fixtures = sorted(by_id.values(), key=lambda f: f.kickoff)
+
+        days: Dict[str, Dict[str, DayBucket]] = {}
+        for name, zone in self.zones.items():
+            buckets: Dict[str, DayBucket] = {}
+            for fixture in fixtures:
+                local = datetime.fromtimestamp(fixture.kickoff, zone)
+                buckets.setdefault(local.strftime("%Y-%m-%d"), []).append((local.strftime("%H:%M"), fixture))
+            days[name] = buckets
+
+        # Swap in whole structures so readers never see a half-built index
+        self.fixtures = fixtures
+        self.days = days
+        self.updated = time.monotonic()
+
+    def age(self) -> float:
+        return time.monotonic() - self.updated if self.updated else float("inf")
+
+    def today(self, tz: str) -> str:
+        """Current local date in `tz`"""
+        return datetime.now(timezone.utc).astimezone(self.zones[tz]).strftime("%Y-%m-%d")
+
+    def day(self, tz: str, date: str, leagues: Optional[Iterable[str]] = None) -> DayBucket:
+        """Fixtures kicking off on local `date` (YYYY-MM-DD) in `tz`"""
+        bucket = self.days.get(tz, {}).get(date, [])
+        if leagues is None:
+            return bucket
+        wanted = set(leagues)
+        return [entry for entry in bucket if entry[1].league in wanted]
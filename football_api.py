@@ -0,0 +1,275 @@
+"""
+Football-Data.org API client shared by the HTTP and stdio servers
+Response cache, circuit breaker, hedged requests and match formatting
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from changes import ChangeLog
+from ingest import project
+from profiling import span
+from resilience import CircuitBreaker, LatencyTracker
+
+# Football-Data.org API Configuration
+API_KEY = os.environ.get("FOOTBALL_API_KEY", "8acc268e54594f698d695ab84a9adc38")
+API_BASE = os.environ.get("FOOTBALL_API_BASE", "https://api.football-data.org/v4")
+HEADERS = {"X-Auth-Token": API_KEY}
+
+# Upstream responses are cached per endpoint (free tier: 10 req/min)
+CACHE_TTL = float(os.environ.get("FOOTBALL_CACHE_TTL", 60))
+_api_cache: Dict[str, Tuple[float, Dict]] = {}
+
+# Called with the endpoint whenever a fresh upstream response differs from the cached one
+data_listeners: List[Callable[[str], None]] = []
+
+# Circuit breaker around the upstream API; hedging is opt-in since it spends quota
+upstream_breaker = CircuitBreaker(
+    failure_threshold=float(os.environ.get("FOOTBALL_BREAKER_FAILURE_RATE", 0.5)),
+    slow_call_duration=float(os.environ.get("FOOTBALL_BREAKER_SLOW_CALL", 5.0)),
+    reset_timeout=float(os.environ.get("FOOTBALL_BREAKER_RESET", 30.0)),
+)
+upstream_latency = LatencyTracker()
+HEDGE_REQUESTS = os.environ.get("FOOTBALL_HEDGE_REQUESTS", "").lower() in ("1", "true", "yes")
+
+# Versioned change log of matches and standings rows, behind the `since` cursors
+change_log = ChangeLog()
+
+# Leagues searched by team tools
+TEAM_LEAGUES = ["PL", "PD", "BL1", "SA", "FL1"]
+
+# League mappings
+LEAGUE_CODES = {
+    "Premier League": "PL",
+    "La Liga": "PD",
+    "Bundesliga": "BL1",
+    "Serie A": "SA",
+    "Ligue 1": "FL1",
+    "Champions League": "CL",
+    "Europa League": "EL",
+}
+LEAGUE_NAMES = {code: name for name, code in LEAGUE_CODES.items()}
+
+
+def get_cached(endpoint: str) -> Optional[Dict]:
+    """Return a fresh cached response for endpoint, if any"""
+    entry = _api_cache.get(endpoint)
+    if entry and time.monotonic() - entry[0] < CACHE_TTL:
+        return entry[1]
+    return None
+
+
+async def _get_body(client: httpx.AsyncClient, endpoint: str) -> bytes:
+    response = await client.get(f"{API_BASE}{endpoint}", headers=HEADERS)
+    response.raise_for_status()
+    return response.content
+
+
+async def _hedged_get(endpoint: str) -> bytes:
+    """GET endpoint, sending a backup request if the first one outlives p95 latency"""
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        primary = asyncio.create_task(_get_body(client, endpoint))
+        hedge_after = upstream_latency.percentile(95) if HEDGE_REQUESTS else None
+        if hedge_after is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        pending = {primary, asyncio.create_task(_get_body(client, endpoint))}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """Timeouts, connection errors, 5xx and 429 count against the circuit breaker"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, httpx.HTTPError)
+
+
+async def fetch_api(endpoint: str) -> Dict:
+    """Fetch data from Football-Data.org API"""
+    cached = get_cached(endpoint)
+    if cached is not None:
+        return cached
+
+    stale = _api_cache.get(endpoint)
+    if not upstream_breaker.allow():
+        # Fail fast while the upstream is unhealthy, serving stale data when we have it
+        if stale:
+            return stale[1]
+        return {"error": f"Football-Data.org API unavailable, retry in {upstream_breaker.retry_after():.0f}s"}
+
+    start = time.monotonic()
+    try:
+        with span("upstream"):
+            body = await _hedged_get(endpoint)
+        # Cache only the fields the tools read
+        with span("parse"):
+            data = project(endpoint, json.loads(body))
+    except Exception as e:
+        if _is_upstream_failure(e):
+            upstream_breaker.record_failure()
+            if stale:
+                return stale[1]
+        else:
+            upstream_breaker.record_success(time.monotonic() - start)
+        if isinstance(e, httpx.HTTPError):
+            return {"error": f"API request failed: {str(e)}"}
+        return {"error": f"Unexpected error: {str(e)}"}
+
+    latency = time.monotonic() - start
+    upstream_breaker.record_success(latency)
+    upstream_latency.add(latency)
+    change_log.record(endpoint, data)
+    _api_cache[endpoint] = (time.monotonic(), data)
+    if stale is None or stale[1] != data:
+        for listener in data_listeners:
+            listener(endpoint)
+    return data
+
+
+def format_match(match: Dict) -> str:
+    """Format a single match for display"""
+    home = match.get("homeTeam", {}).get("name", "Unknown")
+    away = match.get("awayTeam", {}).get("name", "Unknown")
+    home_score = match.get("score", {}).get("fullTime", {}).get("home")
+    away_score = match.get("score", {}).get("fullTime", {}).get("away")
+    status = match.get("status", "SCHEDULED")
+    utc_date = match.get("utcDate", "")
+    
+    # Parse date
+    try:
+        dt = datetime.fromisoformat(utc_date.replace("Z", "+00:00"))
+        date_str = dt.strftime("%Y-%m-%d %H:%M")
+    except:
+        date_str = utc_date
+    
+    if status == "FINISHED" and home_score is not None and away_score is not None:
+        return f"{date_str} | {home} {home_score} - {away_score} {away} [FT]"
+    elif status == "IN_PLAY":
+        return f"{date_str} | {home} vs {away} [LIVE]"
+    else:
+        return f"{date_str} | {home} vs {away}"
+
+
+def recent_matches_endpoint(league_code: str) -> str:
+    """Matches endpoint for the last 7 days"""
+    date_from = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d")
+    date_to = datetime.utcnow().strftime("%Y-%m-%d")
+    return f"/competitions/{league_code}/matches?dateFrom={date_from}&dateTo={date_to}"
+
+
+def upcoming_matches_endpoint(league_code: str) -> str:
+    """Matches endpoint for the next 7 days"""
+    date_from = datetime.utcnow().strftime("%Y-%m-%d")
+    date_to = (datetime.utcnow() + timedelta(days=7)).strftime("%Y-%m-%d")
+    return f"/competitions/{league_code}/matches?dateFrom={date_from}&dateTo={date_to}"
+
+
+def since_version(since: Optional[str]) -> Tuple[Optional[int], Optional[str]]:
+    """Change-log version for a `since` cursor argument, plus a note if the cursor is unusable"""
+    if since is None or since == "":
+        return None, None
+    version = change_log.parse_cursor(since) if isinstance(since, str) else None
+    if version is None:
+        return None, "⚠️ Unknown or expired cursor, showing the full result"
+    return version, None
+
+
+def with_cursor(text: str, endpoint: str, note: Optional[str] = None) -> str:
+    """Tool result followed by the cursor for the endpoint it was built from
+
+    The cursor is the newest change among that endpoint's own matches / rows,
+    so it (and the result's ETag) only moves when this result's data changes.
+    """
+    if text.startswith("❌"):
+        return text
+    if note:
+        text = f"{note}\n\n{text}"
+    entry = _api_cache.get(endpoint)
+    cursor = change_log.cursor(change_log.latest(endpoint, entry[1]) if entry else 0)
+    return f"{text}\n\n🔖 Cursor: {cursor} (pass as 'since' to get only changes)"
+
+
+async def recent_results(league: str, since: Optional[int] = None) -> str:
+    """Recent results (last 7 days) for one league, or only those changed after version `since`"""
+    league_code = LEAGUE_CODES.get(league)
+    
+    if not league_code:
+        return f"❌ League '{league}' not supported. Available: {', '.join(LEAGUE_CODES.keys())}"
+    
+    # Get matches from last 7 days
+    endpoint = recent_matches_endpoint(league_code)
+    data = await fetch_api(endpoint)
+    
+    if "error" in data:
+        return f"❌ {data['error']}"
+    
+    matches = data.get("matches", [])
+    if not matches:
+        return f"No matches found for {league} in the last 7 days"
+    
+    # Filter finished matches
+    finished = [m for m in matches if m.get("status") == "FINISHED"]
+    
+    if not finished:
+        return f"No finished matches for {league} in the last 7 days"
+    
+    if since is not None:
+        changed = [m for m in finished if change_log.match_version(endpoint, m) > since]
+        if not changed:
+            return f"No {league} results changed since the cursor"
+        lines = [f"⚽ {league} Results Changed Since Cursor\n"]
+        lines.extend(format_match(match) for match in changed)
+        return "\n".join(lines)
+    
+    lines = [f"⚽ Recent {league} Results (Last 7 Days)\n"]
+    for match in finished[-10:]:  # Last 10 matches
+        lines.append(format_match(match))
+    
+    return "\n".join(lines)
+
+
+async def matchday_digest(leagues: Iterable[str]) -> AsyncIterator[str]:
+    """Recent results for several leagues, fetched concurrently
+
+    Yields each league's section as soon as it is ready, so the first section
+    arrives after one league's latency rather than after all of them.
+    """
+    tasks = [asyncio.ensure_future(recent_results(league)) for league in leagues]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def digest_leagues(leagues: Optional[List[str]]) -> Tuple[List[str], List[str]]:
+    """Split requested league names into (supported, unknown); default is every league"""
+    if not leagues:
+        return list(LEAGUE_CODES), []
+    if isinstance(leagues, str):
+        leagues = [leagues]
+    supported = [league for league in leagues if league in LEAGUE_CODES]
+    unknown = [league for league in leagues if league not in LEAGUE_CODES]
+    return supported, unknown
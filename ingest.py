@@ -0,0 +1,149 @@
+"""
+Ingest-time projection of Football-Data.org responses
+Each endpoint's payload is cut down to the fields the tools actually read
+before it is cached. Match, standings and team documents keep the upstream
+key names, so formatters use the same .get() chains; squad members and
+scorer rows, read only by the player index, become compact records.
+"""
+import sys
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+
+class SquadMember(NamedTuple):
+    id: int
+    name: str
+    position: Optional[str]
+    nationality: Optional[str]
+    dateOfBirth: Optional[str]
+
+
+class Scorer(NamedTuple):
+    player_id: int
+    name: str
+    position: Optional[str]
+    nationality: Optional[str]
+    dateOfBirth: Optional[str]
+    team_id: Optional[int]
+    team: Optional[str]
+    goals: int
+    assists: int
+    penalties: int
+    playedMatches: int
+
+
+def _pick(obj: Optional[Dict], *keys: str) -> Dict:
+    obj = obj or {}
+    return {key: obj[key] for key in keys if obj.get(key) is not None}
+
+
+def _name(value: Optional[str]) -> Optional[str]:
+    # Names and categorical values (status, position, nationality) repeat across payloads
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _team(team: Optional[Dict]) -> Dict:
+    team = team or {}
+    return {"id": team.get("id"), "name": _name(team.get("name"))}
+
+
+def project_match(match: Dict) -> Dict:
+    full_time = (match.get("score") or {}).get("fullTime") or {}
+    return {
+        "id": match.get("id"),
+        "utcDate": match.get("utcDate"),
+        "status": _name(match.get("status")),
+        "competition": {"code": _name((match.get("competition") or {}).get("code"))},
+        "homeTeam": _team(match.get("homeTeam")),
+        "awayTeam": _team(match.get("awayTeam")),
+        "score": {"fullTime": {"home": full_time.get("home"), "away": full_time.get("away")}},
+    }
+
+
+def project_matches(data: Dict) -> Dict:
+    return {"matches": [project_match(m) for m in data.get("matches", [])]}
+
+
+def project_standings(data: Dict) -> Dict:
+    # Only the main (TOTAL) table is shown; HOME/AWAY splits are dropped
+    return {
+        "standings": [
+            {
+                "type": standing.get("type"),
+                "table": [
+                    {
+                        **_pick(row, "position", "playedGames", "won", "draw", "lost", "goalDifference", "points"),
+                        "team": _team(row.get("team")),
+                    }
+                    for row in standing.get("table", [])
+                ],
+            }
+            for standing in data.get("standings", [])[:1]
+        ]
+    }
+
+
+def project_teams(data: Dict) -> Dict:
+    return {
+        "teams": [
+            {
+                **_pick(team, "id", "shortName", "founded", "venue", "website", "clubColors"),
+                "name": _name(team.get("name")),
+                "squad": [
+                    SquadMember(
+                        id=member["id"],
+                        name=member.get("name") or "Unknown",
+                        position=_name(member.get("position")),
+                        nationality=_name(member.get("nationality")),
+                        dateOfBirth=(member.get("dateOfBirth") or "")[:10] or None,
+                    )
+                    for member in team.get("squad") or []
+                    if member.get("id") is not None
+                ],
+            }
+            for team in data.get("teams", [])
+        ]
+    }
+
+
+def project_scorers(data: Dict) -> Dict:
+    scorers = []
+    for entry in data.get("scorers", []):
+        player = entry.get("player") or {}
+        team = entry.get("team") or {}
+        if player.get("id") is None:
+            continue
+        scorers.append(Scorer(
+            player_id=player["id"],
+            name=player.get("name") or "Unknown",
+            position=_name(player.get("section") or player.get("position")),
+            nationality=_name(player.get("nationality")),
+            dateOfBirth=(player.get("dateOfBirth") or "")[:10] or None,
+            team_id=team.get("id"),
+            team=_name(team.get("name")),
+            goals=entry.get("goals") or 0,
+            assists=entry.get("assists") or 0,
+            penalties=entry.get("penalties") or 0,
+            playedMatches=entry.get("playedMatches") or 0,
+        ))
+    return {"scorers": scorers}
+
+
+def _resource(endpoint: str) -> str:
+    """Last path segment of an endpoint: '/competitions/PL/matches?..' -> 'matches'"""
+    return endpoint.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+
+
+PROJECTIONS: Dict[str, Callable[[Dict], Dict]] = {
+    "matches": project_matches,
+    "standings": project_standings,
+    "teams": project_teams,
+    "scorers": project_scorers,
+}
+
+
+def project(endpoint: str, data: Any) -> Any:
+    """Project an upstream response to its minimal schema; unknown endpoints pass through"""
+    projection = PROJECTIONS.get(_resource(endpoint))
+    if projection is None or not isinstance(data, dict):
+        return data
+    return projection(data)
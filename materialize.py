@@ -0,0 +1,231 @@
+"""
+Precomputed answers for the most popular tool calls
+A count-min sketch estimates how often each (tool, normalized arguments) key
+is called; the hottest keys keep their finished JSON-RPC result pre-encoded,
+rebuilt in the background as soon as the upstream data they read changes.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, FrozenSet, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+
+def call_key(name: str, args: Dict[str, Any]) -> str:
+    """Popularity key for a tool call: name plus arguments with empty values dropped"""
+    normalized = {}
+    for key, value in (args or {}).items():
+        if isinstance(value, str):
+            value = " ".join(value.split())
+        if value not in (None, "", [], {}):
+            normalized[key] = value
+    return f"{name}:{json.dumps(normalized, ensure_ascii=False, sort_keys=True)}"
+
+
+def encode_result(result: Dict) -> bytes:
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class CountMinSketch:
+    """Approximate counts in fixed memory; estimates never undercount"""
+
+    def __init__(self, width: int = 2048, depth: int = 4, decay_every: int = 10000):
+        self.width = width
+        self.depth = depth
+        self.decay_every = decay_every
+        self.rows = [[0] * width for _ in range(depth)]
+        self.added = 0
+
+    def _cells(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * i:4 * i + 4], "little") % self.width for i in range(self.depth)]
+
+    def add(self, key: str) -> int:
+        """Count one occurrence and return the new estimate"""
+        self.added += 1
+        if self.added % self.decay_every == 0:
+            # Halve everything so popularity follows recent traffic
+            self.rows = [[count >> 1 for count in row] for row in self.rows]
+        estimate = None
+        for row, cell in zip(self.rows, self._cells(key)):
+            row[cell] += 1
+            estimate = row[cell] if estimate is None else min(estimate, row[cell])
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(row[cell] for row, cell in zip(self.rows, self._cells(key)))
+
+
+class Materialized(NamedTuple):
+    """A pre-encoded tool result and the data version it was built from"""
+    body: bytes  # JSON-encoded result object
+    etag: str
+    token: Hashable
+    version: int  # the key's version when the build started
+    build_seconds: float
+
+
+Builder = Callable[[str, Dict], Awaitable[Optional[Tuple[Dict, str]]]]
+TokenFn = Callable[[str, Dict], Optional[Hashable]]
+
+
+class Materializer:
+    """Top-N popular tool calls with their results kept ready to send
+
+    Each hot key remembers the upstream endpoints its result is built from,
+    and notify(endpoint) bumps the version of just the keys that read it. An
+    entry is served only while its key's version and token(name, args) still
+    equal what it was built with; the server's token covers upstream
+    freshness and the clock. A None token means the result cannot be built
+    without going upstream.
+
+    Rebuilds happen only after a data change or a new hot key, only for keys
+    called within `recent` seconds, and at most `upstream_budget` rebuilds per
+    minute may go upstream; there is no polling.
+    """
+
+    def __init__(self, top_n: int = 16, min_calls: int = 3, recent: float = 300.0,
+                 upstream_budget: int = 2, sketch: Optional[CountMinSketch] = None):
+        self.top_n = top_n
+        self.min_calls = min_calls
+        self.recent = recent
+        self.upstream_budget = upstream_budget
+        self.sketch = sketch or CountMinSketch()
+        self.hot: Dict[str, Tuple[str, Dict]] = {}
+        self.last_seen: Dict[str, float] = {}
+        self.reads: Dict[str, FrozenSet[str]] = {}
+        self.versions: Dict[str, int] = {}
+        self._upstream_rebuilds: Deque[float] = deque()
+        self.entries: Dict[str, Materialized] = {}
+        self._wake = asyncio.Event()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.rebuilds = 0
+        self.deferred = 0
+
+    def record(self, key: str, name: str, args: Dict, endpoints: Iterable[str]) -> None:
+        """Count a call; admit it to the hot set once it beats the coldest member
+
+        `endpoints` are the upstream endpoints the call's result is built from
+        (they move with the date, so they are refreshed on every call).
+        """
+        estimate = self.sketch.add(key)
+        if key in self.hot:
+            self.last_seen[key] = time.monotonic()
+            self.reads[key] = frozenset(endpoints)
+            return
+        if estimate < self.min_calls:
+            return
+        if len(self.hot) >= self.top_n:
+            coldest = min(self.hot, key=self.sketch.estimate)
+            if self.sketch.estimate(coldest) >= estimate:
+                return
+            for table in (self.hot, self.entries, self.last_seen, self.reads, self.versions):
+                table.pop(coldest, None)
+        self.hot[key] = (name, args)
+        self.last_seen[key] = time.monotonic()
+        self.reads[key] = frozenset(endpoints)
+        self._wake.set()
+
+    def version(self, key: str) -> int:
+        """Bumped whenever data the key's result is built from changes; take it before building"""
+        return self.versions.get(key, 0)
+
+    def _current(self, key: str, entry: Optional[Materialized], token: Optional[Hashable]) -> bool:
+        return entry is not None and token is not None and entry.token == token and entry.version == self.version(key)
+
+    def get(self, key: str, token: Optional[Hashable]) -> Optional[Materialized]:
+        """Ready result for a hot key, if still current"""
+        if key not in self.hot:
+            return None
+        entry = self.entries.get(key)
+        if not self._current(key, entry, token):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.saved_seconds += entry.build_seconds
+        return entry
+
+    def store(self, key: str, result: Dict, etag: str, token: Optional[Hashable], version: int,
+              build_seconds: float) -> None:
+        """Keep a result computed on the normal path, if its key is hot
+
+        `version` is version(key) from before the result was built: data that
+        changed during the build leaves the entry already out of date.
+        """
+        if key in self.hot and token is not None:
+            self.entries[key] = Materialized(encode_result(result), etag, token, version, build_seconds)
+
+    def notify(self, endpoint: str) -> None:
+        """Upstream data changed: results built from this endpoint are out of date until rebuilt"""
+        changed = False
+        for key, endpoints in self.reads.items():
+            if endpoint in endpoints:
+                self.versions[key] = self.version(key) + 1
+                changed = True
+        if changed:
+            self._wake.set()
+
+    def _take_upstream_budget(self) -> bool:
+        now = time.monotonic()
+        while self._upstream_rebuilds and now - self._upstream_rebuilds[0] >= 60:
+            self._upstream_rebuilds.popleft()
+        if len(self._upstream_rebuilds) >= self.upstream_budget:
+            return False
+        self._upstream_rebuilds.append(now)
+        return True
+
+    async def refresh(self, build: Builder, token: TokenFn) -> None:
+        """Rebuild recently called hot entries that are missing or out of date"""
+        now = time.monotonic()
+        for key, (name, args) in list(self.hot.items()):
+            if now - self.last_seen.get(key, 0.0) > self.recent:
+                continue
+            current = token(name, args)
+            if self._current(key, self.entries.get(key), current):
+                continue
+            if current is None and not self._take_upstream_budget():
+                self.deferred += 1
+                continue
+            version = self.version(key)
+            start = time.perf_counter()
+            try:
+                built = await build(name, args)
+            except Exception:
+                continue
+            if built is None or key not in self.hot:
+                continue
+            result, etag = built
+            self.rebuilds += 1
+            self.store(key, result, etag, token(name, args), version, time.perf_counter() - start)
+
+    async def run(self, build: Builder, token: TokenFn) -> None:
+        """Background task: rebuild after each data change or new hot key"""
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            await self.refresh(build, token)
+
+    def stats(self, top: bool = False) -> Dict[str, Any]:
+        """Hit rate and latency saved; with top, the hottest calls and their estimated counts"""
+        lookups = self.hits + self.misses
+        stats = {
+            "calls": self.sketch.added,
+            "hot_keys": len(self.hot),
+            "materialized": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "saved_ms_total": round(self.saved_seconds * 1000, 1),
+            "saved_ms_per_hit": round(self.saved_seconds * 1000 / self.hits, 2) if self.hits else None,
+            "rebuilds": self.rebuilds,
+            "deferred_upstream_rebuilds": self.deferred,
+        }
+        if top:
+            stats["top"] = sorted(
+                ({"call": key, "estimate": self.sketch.estimate(key)} for key in self.hot),
+                key=lambda item: -item["estimate"],
+            )
+        return stats
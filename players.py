@@ -0,0 +1,292 @@
+"""
+Player index built from team squads and top-scorer tables
+Compact per-player records, player -> team and player -> stats joins, and a
+fuzzy name lookup that understands Korean (Hangul) and Latin spellings.
+"""
+import asyncio
+import difflib
+import time
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from football_api import LEAGUE_NAMES, TEAM_LEAGUES, fetch_api
+from ingest import Scorer
+
+
+class Player(NamedTuple):
+    """Compact player record"""
+    id: int
+    name: str
+    position: str
+    nationality: str
+    birth: str  # YYYY-MM-DD
+    team_id: int
+    team: str
+    league: str  # competition code
+
+
+class PlayerStats(NamedTuple):
+    """Current-season scoring stats from /scorers"""
+    goals: int
+    assists: int
+    penalties: int
+    played: int
+
+
+# Common Korean spellings that romanization alone does not recover
+KOREAN_ALIASES = {
+    "손흥민": "Son Heung-Min",
+    "김민재": "Kim Min-Jae",
+    "이강인": "Lee Kang-In",
+    "황희찬": "Hwang Hee-Chan",
+    "황인범": "Hwang In-Beom",
+    "홀란드": "Haaland",
+    "홀란": "Haaland",
+    "음바페": "Mbappe",
+    "케인": "Kane",
+    "살라": "Salah",
+    "벨링엄": "Bellingham",
+    "비니시우스": "Vinicius",
+    "레반도프스키": "Lewandowski",
+    "메시": "Messi",
+    "호날두": "Ronaldo",
+    "라우타로": "Lautaro",
+    "야말": "Yamal",
+    "사카": "Saka",
+    "팔머": "Palmer",
+}
+
+# Revised Romanization jamo tables (initial, medial, final)
+_INITIALS = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+_MEDIALS = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we", "wi", "yu", "eu", "ui", "i"]
+_FINALS = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l", "p", "l", "m", "p", "p", "t", "t", "ng", "t", "t", "k", "t", "p", "t"]
+_EU = _MEDIALS.index("eu")
+
+# Loose consonant classes so transliterations of the same sound collapse together
+_SKELETON = str.maketrans({"g": "k", "c": "k", "q": "k", "d": "t", "b": "p", "f": "p", "v": "p", "r": "l", "z": "s", "x": "s"})
+_VOWELS = set("aeiouy")
+
+
+def romanize(text: str) -> str:
+    """Romanize Hangul syllables; other characters pass through
+
+    A bare 'eu' after the first syllable is dropped: it is the vowel Korean
+    inserts after foreign consonants (홀란드 -> holrand, not holrandeu).
+    """
+    out = []
+    for position, ch in enumerate(text):
+        code = ord(ch) - 0xAC00
+        if not 0 <= code < 11172:
+            out.append(ch)
+            continue
+        initial, medial, final = code // 588, (code % 588) // 28, code % 28
+        vowel = "" if medial == _EU and not final and position else _MEDIALS[medial]
+        out.append(_INITIALS[initial] + vowel + _FINALS[final])
+    return "".join(out)
+
+
+def normalize(text: str) -> str:
+    """Lowercase ASCII words: accents stripped, Hangul romanized, punctuation removed"""
+    text = unicodedata.normalize("NFKD", romanize(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in text).split())
+
+
+def skeleton(compact: str) -> str:
+    """Consonant skeleton of a normalized word, for transliteration-tolerant matching"""
+    out = []
+    for ch in compact.translate(_SKELETON):
+        if ch in _VOWELS or (out and out[-1] == ch):
+            continue
+        out.append(ch)
+    return "".join(out)
+
+
+class PlayerIndex:
+    """In-memory player records with name lookup and team/stats joins"""
+
+    def __init__(self):
+        self.players: Dict[int, Player] = {}
+        self.stats: Dict[int, PlayerStats] = {}
+        self._exact: Dict[str, List[int]] = {}
+        self._skeletons: Dict[str, List[str]] = {}  # skeleton -> name keys
+        self.updated = 0.0
+        self._lock = asyncio.Lock()
+
+    def load(self, teams: Dict[str, List[Dict]], scorers: Dict[str, List[Scorer]]) -> None:
+        """Rebuild from projected /teams and /scorers payloads (see ingest), keyed by competition code"""
+        players: Dict[int, Player] = {}
+        stats: Dict[int, PlayerStats] = {}
+
+        for league, league_teams in teams.items():
+            for team in league_teams:
+                for member in team.get("squad") or []:
+                    players[member.id] = Player(
+                        id=member.id,
+                        name=member.name,
+                        position=member.position or "-",
+                        nationality=member.nationality or "-",
+                        birth=member.dateOfBirth or "-",
+                        team_id=team.get("id", 0),
+                        team=team.get("name", "Unknown"),
+                        league=league,
+                    )
+
+        for league, entries in scorers.items():
+            for entry in entries:
+                if entry.player_id not in players:
+                    # Scorers outside the indexed squads (e.g. cup competitions)
+                    players[entry.player_id] = Player(
+                        id=entry.player_id,
+                        name=entry.name,
+                        position=entry.position or "-",
+                        nationality=entry.nationality or "-",
+                        birth=entry.dateOfBirth or "-",
+                        team_id=entry.team_id or 0,
+                        team=entry.team or "Unknown",
+                        league=league,
+                    )
+                previous = stats.get(entry.player_id)
+                if previous is None or entry.goals > previous.goals:
+                    stats[entry.player_id] = PlayerStats(
+                        goals=entry.goals,
+                        assists=entry.assists,
+                        penalties=entry.penalties,
+                        played=entry.playedMatches,
+                    )
+
+        exact: Dict[str, List[int]] = {}
+        for player in players.values():
+            words = normalize(player.name).split()
+            keys = {"".join(words)} | {word for word in words if len(word) >= 3}
+            for key in keys:
+                exact.setdefault(key, []).append(player.id)
+        skeletons: Dict[str, List[str]] = {}
+        for key in exact:
+            skeletons.setdefault(skeleton(key), []).append(key)
+
+        self.players, self.stats = players, stats
+        self._exact, self._skeletons = exact, skeletons
+        self.updated = time.monotonic()
+
+    def _best(self, ids: Iterable[int]) -> Player:
+        # Prefer the player with the most goals, then the shortest name
+        return max(
+            (self.players[pid] for pid in ids),
+            key=lambda p: (self.stats.get(p.id, PlayerStats(0, 0, 0, 0)).goals, -len(p.name)),
+        )
+
+    def find(self, query: str) -> Optional[Player]:
+        """Best match for a player name in Korean or Latin script"""
+        query = KOREAN_ALIASES.get(query.strip().replace(" ", ""), query)
+        compact = normalize(query).replace(" ", "")
+        if not compact:
+            return None
+
+        if compact in self._exact:
+            return self._best(self._exact[compact])
+
+        if len(compact) >= 4:
+            hits = [pid for key, ids in self._exact.items() if compact in key for pid in ids]
+            if hits:
+                return self._best(hits)
+
+        # Short skeletons collide across unrelated names (messi / amos -> ms), so
+        # a skeleton match also needs the same first letter and a similar spelling
+        consonants = skeleton(compact)
+        if len(consonants) >= 4:
+            keys = [
+                key for key in self._skeletons.get(consonants, [])
+                if key[0] == compact[0] and difflib.SequenceMatcher(None, compact, key).ratio() >= 0.6
+            ]
+            if keys:
+                return self._best(pid for key in keys for pid in self._exact[key])
+
+        close = difflib.get_close_matches(compact, self._exact.keys(), n=1, cutoff=0.8)
+        if close:
+            return self._best(self._exact[close[0]])
+        return None
+
+    async def refresh(self) -> Optional[str]:
+        """Reload squads and scorers from the API. Returns an error message on failure"""
+        teams: Dict[str, List[Dict]] = {}
+        scorers: Dict[str, List[Dict]] = {}
+        for code in TEAM_LEAGUES:
+            data = await fetch_api(f"/competitions/{code}/teams")
+            if "error" in data:
+                return data["error"]
+            teams[code] = data.get("teams", [])
+        for code in TEAM_LEAGUES:
+            data = await fetch_api(f"/competitions/{code}/scorers?limit=50")
+            if "error" in data:
+                return data["error"]
+            scorers[code] = data.get("scorers", [])
+        self.load(teams, scorers)
+        return None
+
+    async def ensure_loaded(self) -> Optional[str]:
+        """Load the index on first use; later refreshes happen in the background"""
+        if self.updated:
+            return None
+        async with self._lock:
+            if self.updated:
+                return None
+            return await self.refresh()
+
+    async def refresh_forever(self, interval: float) -> None:
+        """Background task: reload every `interval` seconds once the index is in use
+
+        Lookups keep reading the current index while the reload fetches;
+        load() swaps the new one in at the end. Nothing is fetched until the
+        first lookup has loaded the index, so startup costs no API quota.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if self.updated:
+                await self.refresh()
+
+
+def format_player(index: PlayerIndex, player: Player) -> str:
+    """Player profile joined with team and scoring stats"""
+    lines = [
+        f"👤 {player.name}",
+        f"Team: {player.team} ({LEAGUE_NAMES.get(player.league, player.league)})",
+        f"Position: {player.position}",
+        f"Nationality: {player.nationality}",
+        f"Born: {player.birth}",
+    ]
+    stats = index.stats.get(player.id)
+    if stats:
+        lines.append(
+            f"Season: {stats.goals} goals, {stats.assists} assists in {stats.played} matches"
+            f" ({stats.penalties} penalties)"
+        )
+    else:
+        lines.append("Season: not among the league's top scorers")
+    return "\n".join(lines)
+
+
+def format_comparison(index: PlayerIndex, first: Player, second: Player) -> str:
+    """Side-by-side comparison of two players"""
+    def row(label: str, a: object, b: object) -> str:
+        return f"{label:12} | {str(a)[:24]:24} | {str(b)[:24]}"
+
+    empty = PlayerStats(0, 0, 0, 0)
+    a, b = index.stats.get(first.id, empty), index.stats.get(second.id, empty)
+    per_match = lambda s: f"{s.goals / s.played:.2f}" if s.played else "-"
+
+    lines = [
+        f"⚖️ {first.name} vs {second.name}\n",
+        row("", first.name, second.name),
+        "-" * 64,
+        row("Team", first.team, second.team),
+        row("Position", first.position, second.position),
+        row("Nationality", first.nationality, second.nationality),
+        row("Born", first.birth, second.birth),
+        row("Matches", a.played, b.played),
+        row("Goals", a.goals, b.goals),
+        row("Assists", a.assists, b.assists),
+        row("Penalties", a.penalties, b.penalties),
+        row("Goals/match", per_match(a), per_match(b)),
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,266 @@
+"""
+On-demand profiling shared by the HTTP and stdio servers
+Time-boxed cProfile or stack-sampling captures of the running process,
+per-request span timings for slow requests (kept in a ring buffer) and an
+asyncio event-loop lag monitor.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+MAX_CAPTURE_SECONDS = 60.0
+
+
+class Trace:
+    """Span timings of one request; spans with the same name accumulate"""
+
+    __slots__ = ("name", "started", "spans")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self.spans: Dict[str, float] = {}
+
+    def add(self, span_name: str, seconds: float) -> None:
+        self.spans[span_name] = self.spans.get(span_name, 0.0) + seconds
+
+    def as_dict(self, duration: float) -> Dict[str, Any]:
+        spans = {name: round(seconds * 1000, 2) for name, seconds in self.spans.items()}
+        if "execute" in self.spans:
+            # Tool time not spent waiting on the upstream or parsing: formatting the answer
+            render = self.spans["execute"] - self.spans.get("upstream", 0.0) - self.spans.get("parse", 0.0)
+            spans["render"] = round(max(render, 0.0) * 1000, 2)
+        return {
+            "name": self.name,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+            "duration_ms": round(duration * 1000, 2),
+            "spans_ms": spans,
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block into the current request's trace (no-op outside a request)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start)
+
+
+def set_trace_name(name: str) -> None:
+    """Label the current request's trace, e.g. with the tool being called"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.name = name
+
+
+class SlowRequestLog:
+    """Ring buffer of traces for requests slower than `threshold` seconds"""
+
+    def __init__(self, threshold: float, size: int = 100):
+        self.threshold = threshold
+        self.traces: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self.requests = 0
+        self.slow = 0
+
+    @contextmanager
+    def request(self, name: str) -> Iterator[Trace]:
+        trace = Trace(name)
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            duration = time.perf_counter() - start
+            self.requests += 1
+            if duration >= self.threshold:
+                self.slow += 1
+                self.traces.append(trace.as_dict(duration))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threshold_ms": round(self.threshold * 1000),
+            "requests": self.requests,
+            "slow": self.slow,
+            "traces": list(self.traces),
+        }
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a trace per request on `path`"""
+
+    def __init__(self, app, log: SlowRequestLog, path: str = "/mcp"):
+        self.app = app
+        self.log = log
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            return await self.app(scope, receive, send)
+        with self.log.request(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a sleeping task (stalls show up as lag)"""
+
+    def __init__(self, interval: float = 0.5, window: int = 600, stall: float = 0.1):
+        self.interval = interval
+        self.stall = stall
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.max_lag = 0.0
+        self.stalls = 0
+
+    async def run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - start - self.interval, 0.0)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.stall:
+                self.stalls += 1
+
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        pick = lambda pct: round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000, 2) if ordered else None
+        return {
+            "interval_ms": round(self.interval * 1000),
+            "samples": len(ordered),
+            "last_ms": round(self.samples[-1] * 1000, 2) if self.samples else None,
+            "p50_ms": pick(50),
+            "p99_ms": pick(99),
+            "max_ms": round(self.max_lag * 1000, 2),
+            f"stalls_over_{round(self.stall * 1000)}ms": self.stalls,
+        }
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _sample_stacks(thread_id: int, seconds: float, interval: float) -> Counter:
+    """Collapsed stacks of one thread, sampled every `interval` seconds"""
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        labels: List[str] = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            stacks[";".join(reversed(labels))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+class Profiler:
+    """Time-boxed captures of the event-loop thread, one at a time"""
+
+    def __init__(self):
+        self.busy = False
+
+    async def capture(self, seconds: float, mode: str = "cprofile", text: bool = False) -> Tuple[bytes, str]:
+        """Profile for `seconds` and return (payload, file extension)
+
+        cprofile: pstats dump (load with pstats.Stats) or, with text, the top
+        functions by cumulative time. sample: collapsed stacks, one
+        'frame;frame;... count' line each, for flamegraph tools.
+        """
+        if self.busy:
+            raise RuntimeError("A profile capture is already running")
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"Unknown profile mode: {mode}")
+        seconds = min(max(seconds, 0.1), MAX_CAPTURE_SECONDS)
+
+        self.busy = True
+        try:
+            if mode == "sample":
+                stacks = await asyncio.to_thread(_sample_stacks, threading.get_ident(), seconds, 0.005)
+                lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+                return "\n".join(lines).encode(), "txt"
+
+            import cProfile
+            import io
+            import marshal
+            import pstats
+
+            # cProfile hooks the current thread only: the event loop, where requests run
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profile.disable()
+
+            if text:
+                out = io.StringIO()
+                pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(40)
+                return out.getvalue().encode(), "txt"
+            profile.create_stats()
+            return marshal.dumps(profile.stats), "pstats"
+        finally:
+            self.busy = False
+
+
+def install_signal_handlers(profiler: Profiler, log: SlowRequestLog, lag: LoopLagMonitor,
+                            directory: str, seconds: float) -> bool:
+    """For servers without an HTTP surface (stdio)
+
+    SIGUSR1 writes a time-boxed cProfile capture and SIGUSR2 the slow-request
+    traces and loop-lag stats, both as files in `directory`. Returns False
+    where signals are unavailable (Windows).
+    """
+    import signal
+
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    loop = asyncio.get_running_loop()
+    background = set()
+
+    def write(stem: str, extension: str, payload: bytes) -> None:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{stem}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.{extension}")
+        with open(path, "wb") as f:
+            f.write(payload)
+
+    async def dump_profile() -> None:
+        try:
+            payload, extension = await profiler.capture(seconds)
+        except RuntimeError:
+            return
+        write("profile", extension, payload)
+
+    def on_profile() -> None:
+        task = asyncio.ensure_future(dump_profile())
+        background.add(task)
+        task.add_done_callback(background.discard)
+
+    def on_traces() -> None:
+        stats = {"slow_requests": log.stats(), "loop_lag": lag.stats()}
+        write("traces", "json", json.dumps(stats, indent=2).encode())
+
+    try:
+        loop.add_signal_handler(signal.SIGUSR1, on_profile)
+        loop.add_signal_handler(signal.SIGUSR2, on_traces)
+    except (NotImplementedError, RuntimeError):
+        return False
+    return True
@@ -0,0 +1,130 @@
+"""
+Resilience helpers for upstream API calls
+Circuit breaker and latency tracking for hedged requests
+"""
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency at `pct` (0-100), or None until enough samples are collected"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """Circuit breaker over a rolling window of call outcomes
+
+    Opens when the failure rate or the slow-call rate crosses its threshold,
+    rejects calls for `reset_timeout` seconds, then lets `half_open_calls`
+    trial calls through. All trials succeeding closes it again; any failure reopens it.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_threshold: float = 0.5,
+        slow_call_threshold: float = 0.8,
+        slow_call_duration: float = 5.0,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 2,
+    ):
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_duration = slow_call_duration
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (failed, slow)
+        self._trials = 0
+        self._trial_successes = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream right now"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self._half_open()
+
+        if self.state == HALF_OPEN:
+            if self._trials >= self.half_open_calls:
+                # Trials that never reported back (e.g. cancelled) must not wedge the breaker
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self._half_open()
+            self._trials += 1
+
+        return True
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will let a trial call through"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self, latency: float) -> None:
+        slow = latency >= self.slow_call_duration
+        if self.state == HALF_OPEN:
+            if slow:
+                self._open()
+                return
+            self._trial_successes += 1
+            if self._trial_successes >= self.half_open_calls:
+                self.state = CLOSED
+                self._outcomes.clear()
+            return
+        if self.state == CLOSED:
+            self._outcomes.append((False, slow))
+            self._evaluate()
+
+    def record_failure(self) -> None:
+        if self.state == HALF_OPEN:
+            self._open()
+        elif self.state == CLOSED:
+            self._outcomes.append((True, False))
+            self._evaluate()
+
+    def _evaluate(self) -> None:
+        total = len(self._outcomes)
+        if total < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, is_slow in self._outcomes if is_slow)
+        if failures / total >= self.failure_threshold or slow / total >= self.slow_call_threshold:
+            self._open()
+
+    def _half_open(self) -> None:
+        self.state = HALF_OPEN
+        self.opened_at = time.monotonic()
+        self._trials = 0
+        self._trial_successes = 0
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def stats(self) -> Dict[str, object]:
+        return {"state": self.state, "retry_after": round(self.retry_after(), 1)}
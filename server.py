@@ -4,39 +4,123 @@ Real-time football data with actual API calls
 """
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Any, Dict, Optional
-import httpx
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import hashlib
+import hmac
+import json
 import os
+import time
 from datetime import datetime, timedelta
 
+from admission import (
+    LANE_CACHED,
+    LANE_UPSTREAM,
+    AdmissionController,
+    AdmissionMiddleware,
+    ClientLimiter,
+)
+from compression import CompressionMiddleware
+from fixtures import DEFAULT_TIMEZONES, DayBucket, Fixture, FixtureIndex
+from football_api import (
+    LEAGUE_CODES,
+    LEAGUE_NAMES,
+    TEAM_LEAGUES,
+    change_log,
+    data_listeners,
+    digest_leagues,
+    fetch_api,
+    format_match,
+    get_cached,
+    matchday_digest,
+    recent_matches_endpoint,
+    recent_results,
+    since_version,
+    upcoming_matches_endpoint,
+    upstream_breaker,
+    with_cursor,
+)
+from materialize import Materialized, Materializer, call_key, encode_result
+from players import PlayerIndex, format_comparison, format_player
+from profiling import (
+    LoopLagMonitor,
+    Profiler,
+    SlowRequestLog,
+    TracingMiddleware,
+    set_trace_name,
+    span,
+)
+
 app = FastAPI(title="Weekly Soccer MCP")
 
+# Admission control: per-client token buckets + global in-flight limit
+admission = AdmissionController(
+    max_in_flight=int(os.environ.get("MCP_MAX_IN_FLIGHT", 32)),
+    max_queue=int(os.environ.get("MCP_MAX_QUEUE", 64)),
+    queue_timeout=float(os.environ.get("MCP_QUEUE_TIMEOUT", 5.0)),
+)
+client_limiter = ClientLimiter(
+    rate=float(os.environ.get("MCP_CLIENT_RATE", 2.0)),
+    burst=float(os.environ.get("MCP_CLIENT_BURST", 10)),
+)
+
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=admission,
+    limiter=client_limiter,
+    classify=lambda name, args: tool_lane(name, args),
+    # Proxies in front of the server that append to X-Forwarded-For (Railway: 1; 0 if exposed directly)
+    trusted_proxies=int(os.environ.get("MCP_TRUSTED_PROXIES", 1)),
+    client_keys=frozenset(key.strip() for key in os.environ.get("MCP_CLIENT_KEYS", "").split(",") if key.strip()),
+)
+
+# Per-request span timings (queue, upstream, parse, render) for slow /mcp requests
+slow_requests = SlowRequestLog(
+    threshold=float(os.environ.get("MCP_SLOW_REQUEST_MS", 1000)) / 1000,
+    size=int(os.environ.get("MCP_SLOW_REQUEST_BUFFER", 100)),
+)
+app.add_middleware(TracingMiddleware, log=slow_requests)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Retry-After"],
 )
 
-# Football-Data.org API Configuration
-API_KEY = os.environ.get("FOOTBALL_API_KEY", "8acc268e54594f698d695ab84a9adc38")
-API_BASE = "https://api.football-data.org/v4"
-HEADERS = {"X-Auth-Token": API_KEY}
+# Negotiated zstd/br/gzip compression for responses over the size threshold
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get("MCP_COMPRESS_MIN_SIZE", 1024)),
+)
 
-# League mappings
-LEAGUE_CODES = {
-    "Premier League": "PL",
-    "La Liga": "PD",
-    "Bundesliga": "BL1",
-    "Serie A": "SA",
-    "Ligue 1": "FL1",
-    "Champions League": "CL",
-    "Europa League": "EL",
-}
+# Fixture index: kickoffs parsed once, bucketed by local day per time zone
+FIXTURE_TIMEZONES = [tz.strip() for tz in os.environ.get("FIXTURE_TIMEZONES", ",".join(DEFAULT_TIMEZONES)).split(",") if tz.strip()]
+FIXTURE_REFRESH = float(os.environ.get("FIXTURE_REFRESH", 300))
+fixture_index = FixtureIndex(FIXTURE_TIMEZONES)
+_fixture_lock = asyncio.Lock()
 
+# Player index from squads + scorers, refreshed in the background
+PLAYER_REFRESH = float(os.environ.get("PLAYER_REFRESH", 3600))
+player_index = PlayerIndex()
+
+# Popular tool calls answered from pre-rendered results, rebuilt when their data changes
+materialized = Materializer(
+    top_n=int(os.environ.get("MATERIALIZE_TOP_N", 16)),
+    min_calls=int(os.environ.get("MATERIALIZE_MIN_CALLS", 3)),
+    recent=float(os.environ.get("MATERIALIZE_RECENT", 300)),
+    upstream_budget=int(os.environ.get("MATERIALIZE_UPSTREAM_BUDGET", 2)),
+)
+data_listeners.append(materialized.notify)
+
+# Admin-only profiling endpoints (/admin/*) are disabled unless a token is set
+ADMIN_TOKEN = os.environ.get("MCP_ADMIN_TOKEN", "")
+profiler = Profiler()
+loop_lag = LoopLagMonitor(interval=float(os.environ.get("MCP_LOOP_LAG_INTERVAL", 0.5)))
 
 class MCPRequest(BaseModel):
     jsonrpc: str = "2.0"
@@ -52,14 +136,19 @@ TOOLS = [
         "description": """Get recent football match results from the last 7 days.
         
         Supports: Premier League, La Liga, Bundesliga, Serie A, Ligue 1, Champions League, Europa League.
-        Returns actual match data with scores, dates, and teams.""",
+        Returns actual match data with scores, dates, and teams.
+        Pass the returned cursor as 'since' to poll for changed results only.""",
         "inputSchema": {
             "type": "object",
             "properties": {
                 "league": {
                     "type": "string",
                     "description": "League name (e.g., 'Premier League', 'La Liga')",
-                }
+                },
+                "since": {
+                    "type": "string",
+                    "description": "Cursor from a previous result; returns only matches changed since then",
+                },
             },
             "required": ["league"],
         },
@@ -69,14 +158,19 @@ TOOLS = [
         "description": """Get upcoming football matches for the next 7 days.
         
         Supports major European leagues and competitions.
-        Returns scheduled fixtures with dates and times.""",
+        Returns scheduled fixtures with dates and times.
+        Pass the returned cursor as 'since' to poll for changed fixtures only.""",
         "inputSchema": {
             "type": "object",
             "properties": {
                 "league": {
                     "type": "string",
                     "description": "League name",
-                }
+                },
+                "since": {
+                    "type": "string",
+                    "description": "Cursor from a previous result; returns only matches changed since then",
+                },
             },
             "required": ["league"],
         },
@@ -86,14 +180,19 @@ TOOLS = [
         "description": """Get current league standings/table.
         
         Returns live standings with: Position, Team, Played, Won, Drawn, Lost, Points, Goal Difference.
-        Updated after every match.""",
+        Updated after every match.
+        Pass the returned cursor as 'since' to poll for changed rows only.""",
         "inputSchema": {
             "type": "object",
             "properties": {
                 "league": {
                     "type": "string",
                     "description": "League name",
-                }
+                },
+                "since": {
+                    "type": "string",
+                    "description": "Cursor from a previous result; returns only rows changed since then",
+                },
             },
             "required": ["league"],
         },
@@ -130,48 +229,119 @@ TOOLS = [
             "required": ["query"],
         },
     },
+    {
+        "name": "get_player_info",
+        "description": """Get information about a player.
+        
+        Accepts Korean or Latin spellings (e.g. '손흥민', 'Haaland').
+        Returns: Team, league, position, nationality, birth date, season goals and assists.""",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "player_name": {
+                    "type": "string",
+                    "description": "Player name",
+                }
+            },
+            "required": ["player_name"],
+        },
+    },
+    {
+        "name": "compare_players",
+        "description": """Compare two players side by side.
+        
+        Returns team, position, matches, goals, assists and goals per match for both players.""",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "player1": {
+                    "type": "string",
+                    "description": "First player name",
+                },
+                "player2": {
+                    "type": "string",
+                    "description": "Second player name",
+                },
+            },
+            "required": ["player1", "player2"],
+        },
+    },
+    {
+        "name": "get_matchday_digest",
+        "description": """Get recent results (last 7 days) for several leagues in one call.
+        
+        Leagues are fetched concurrently and each league's section is streamed as soon as it is ready.
+        Defaults to every supported league.""",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "leagues": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "(Optional) League names, e.g. ['Premier League', 'La Liga'] (default: all)",
+                },
+            },
+        },
+    },
+    {
+        "name": "get_matches_by_day",
+        "description": """Get all matches on one day across leagues, in local time.
+        
+        Defaults to today in Korean time (Asia/Seoul).
+        Returns kickoff times, teams and scores grouped by league.""",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "date": {
+                    "type": "string",
+                    "description": "'today', 'tomorrow', 'yesterday' or YYYY-MM-DD (default: today)",
+                },
+                "timezone": {
+                    "type": "string",
+                    "description": "Time zone, e.g. 'Asia/Seoul' or 'UTC' (default: Asia/Seoul)",
+                },
+                "leagues": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "(Optional) League names to include (default: all)",
+                },
+            },
+        },
+    },
+    {
+        "name": "get_weekly_schedule",
+        "description": """Get a day-by-day schedule across leagues, in local time.
+        
+        Covers up to 7 days from the start date (default: today in Korean time).
+        Returns each day's matches with kickoff times, teams and scores.""",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "start": {
+                    "type": "string",
+                    "description": "'today', 'tomorrow', 'yesterday' or YYYY-MM-DD (default: today)",
+                },
+                "days": {
+                    "type": "number",
+                    "description": "Number of days, 1-7 (default: 7)",
+                },
+                "timezone": {
+                    "type": "string",
+                    "description": "Time zone, e.g. 'Asia/Seoul' or 'UTC' (default: Asia/Seoul)",
+                },
+                "leagues": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "(Optional) League names to include (default: all)",
+                },
+            },
+        },
+    },
 ]
 
 
-async def fetch_api(endpoint: str) -> Dict:
-    """Fetch data from Football-Data.org API"""
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{API_BASE}{endpoint}", headers=HEADERS)
-            response.raise_for_status()
-            return response.json()
-    except httpx.HTTPError as e:
-        return {"error": f"API request failed: {str(e)}"}
-    except Exception as e:
-        return {"error": f"Unexpected error: {str(e)}"}
-
-
-def format_match(match: Dict) -> str:
-    """Format a single match for display"""
-    home = match.get("homeTeam", {}).get("name", "Unknown")
-    away = match.get("awayTeam", {}).get("name", "Unknown")
-    home_score = match.get("score", {}).get("fullTime", {}).get("home")
-    away_score = match.get("score", {}).get("fullTime", {}).get("away")
-    status = match.get("status", "SCHEDULED")
-    utc_date = match.get("utcDate", "")
-    
-    # Parse date
-    try:
-        dt = datetime.fromisoformat(utc_date.replace("Z", "+00:00"))
-        date_str = dt.strftime("%Y-%m-%d %H:%M")
-    except:
-        date_str = utc_date
-    
-    if status == "FINISHED" and home_score is not None and away_score is not None:
-        return f"{date_str} | {home} {home_score} - {away_score} {away} [FT]"
-    elif status == "IN_PLAY":
-        return f"{date_str} | {home} vs {away} [LIVE]"
-    else:
-        return f"{date_str} | {home} vs {away}"
-
-
-def format_standings(standings_data: Dict) -> str:
-    """Format league standings table"""
+def format_standings(standings_data: Dict, endpoint: str = "", since: Optional[int] = None) -> str:
+    """Format league standings table, or only the rows of `endpoint` changed after version `since`"""
     if "error" in standings_data:
         return standings_data["error"]
     
@@ -183,6 +353,11 @@ def format_standings(standings_data: Dict) -> str:
     table = standings[0].get("table", [])
     
     lines = ["📊 League Standings\n"]
+    if since is not None:
+        table = [entry for entry in table if change_log.standing_version(endpoint, entry) > since]
+        if not table:
+            return "No standings changes since the cursor"
+        lines = ["📊 League Standings (Changed Rows)\n"]
     lines.append("Pos | Team | P | W | D | L | GD | Pts")
     lines.append("-" * 50)
     
@@ -201,40 +376,186 @@ def format_standings(standings_data: Dict) -> str:
     return "\n".join(lines)
 
 
+def fixture_endpoints() -> List[str]:
+    """Matches endpoints covering roughly a week either side of today (max 10 days each)"""
+    today = datetime.utcnow().date()
+    codes = ",".join(LEAGUE_CODES.values())
+    windows = [(today - timedelta(days=8), today), (today + timedelta(days=1), today + timedelta(days=9))]
+    return [
+        f"/matches?competitions={codes}&dateFrom={start:%Y-%m-%d}&dateTo={end:%Y-%m-%d}"
+        for start, end in windows
+    ]
+
+
+async def refresh_fixture_index() -> Optional[str]:
+    """Reload the fixture index if it is stale. Returns an error message on failure"""
+    async with _fixture_lock:
+        if fixture_index.age() < FIXTURE_REFRESH:
+            return None
+        matches = []
+        for endpoint in fixture_endpoints():
+            data = await fetch_api(endpoint)
+            if "error" in data:
+                # Keep serving the previous index if we have one
+                return None if fixture_index.updated else data["error"]
+            matches.extend(data.get("matches", []))
+        fixture_index.load(matches)
+        return None
+
+
+def resolve_day(value: str, tz: str) -> Optional[str]:
+    """Turn 'today'/'tomorrow'/'yesterday'/YYYY-MM-DD into a local YYYY-MM-DD"""
+    value = (value or "today").strip().lower()
+    offsets = {"yesterday": -1, "today": 0, "tomorrow": 1}
+    if value in offsets:
+        today = datetime.strptime(fixture_index.today(tz), "%Y-%m-%d")
+        return (today + timedelta(days=offsets[value])).strftime("%Y-%m-%d")
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def format_fixture(local_time: str, fixture: Fixture) -> str:
+    """Format an indexed fixture for display"""
+    if fixture.status == "FINISHED" and fixture.home_score is not None and fixture.away_score is not None:
+        return f"{local_time} | {fixture.home} {fixture.home_score} - {fixture.away_score} {fixture.away} [FT]"
+    elif fixture.status in ("IN_PLAY", "PAUSED"):
+        return f"{local_time} | {fixture.home} vs {fixture.away} [LIVE]"
+    else:
+        return f"{local_time} | {fixture.home} vs {fixture.away}"
+
+
+def format_day(bucket: DayBucket) -> List[str]:
+    """Lines for one day's fixtures, grouped by league"""
+    lines = []
+    current_league = None
+    for league_code in LEAGUE_CODES.values():
+        for local_time, fixture in bucket:
+            if fixture.league != league_code:
+                continue
+            if current_league != league_code:
+                current_league = league_code
+                lines.append(f"\n🏆 {LEAGUE_NAMES[league_code]}")
+            lines.append(format_fixture(local_time, fixture))
+    return lines
+
+
+async def schedule_view(args: Dict, start_key: str, days: int) -> str:
+    """Multi-league schedule for `days` local days, served from the fixture index"""
+    tz = args.get("timezone") or FIXTURE_TIMEZONES[0]
+    if tz not in fixture_index.zones:
+        return f"❌ Time zone '{tz}' not supported. Available: {', '.join(fixture_index.zones)}"
+
+    leagues = args.get("leagues") or None
+    if isinstance(leagues, str):
+        leagues = [leagues]
+    if leagues:
+        unknown = [league for league in leagues if league not in LEAGUE_CODES]
+        if unknown:
+            return f"❌ League '{unknown[0]}' not supported. Available: {', '.join(LEAGUE_CODES.keys())}"
+        leagues = [LEAGUE_CODES[league] for league in leagues]
+
+    start = resolve_day(args.get(start_key, "today"), tz)
+    if not start:
+        return f"❌ Invalid date '{args.get(start_key)}'. Use 'today', 'tomorrow', 'yesterday' or YYYY-MM-DD"
+
+    error = await refresh_fixture_index()
+    if error:
+        return f"❌ {error}"
+
+    first = datetime.strptime(start, "%Y-%m-%d")
+    lines = []
+    for offset in range(days):
+        date = (first + timedelta(days=offset)).strftime("%Y-%m-%d")
+        bucket = fixture_index.day(tz, date, leagues)
+        if days == 1:
+            lines.append(f"📅 Matches on {date} ({tz})")
+        elif bucket:
+            lines.append(f"\n📅 {date}")
+        lines.extend(format_day(bucket))
+
+    if days == 1 and len(lines) == 1:
+        return f"No matches on {start} ({tz})"
+    if days > 1:
+        if not lines:
+            return f"No matches from {start} for {days} days ({tz})"
+        lines.insert(0, f"🗓️ Schedule from {start} ({days} days, {tz})")
+    return "\n".join(lines)
+
+
+def tool_endpoints(name: str, args: Dict) -> List[str]:
+    """Upstream endpoints a tool call will read"""
+    if name in ("get_team_info", "search_team"):
+        return [f"/competitions/{code}/teams" for code in TEAM_LEAGUES]
+    if name in ("get_player_info", "compare_players"):
+        return [] if player_index.updated else [f"/competitions/{code}/teams" for code in TEAM_LEAGUES]
+    if name == "get_matchday_digest":
+        leagues, _ = digest_leagues(args.get("leagues"))
+        return [recent_matches_endpoint(LEAGUE_CODES[league]) for league in leagues]
+    if name in ("get_matches_by_day", "get_weekly_schedule"):
+        return [] if fixture_index.age() < FIXTURE_REFRESH else fixture_endpoints()
+
+    league_code = LEAGUE_CODES.get(args.get("league", ""))
+    if not league_code:
+        return []
+    if name == "get_recent_matches":
+        return [recent_matches_endpoint(league_code)]
+    if name == "get_upcoming_matches":
+        return [upcoming_matches_endpoint(league_code)]
+    if name == "get_league_standings":
+        return [f"/competitions/{league_code}/standings"]
+    return []
+
+
+def data_endpoints(name: str, args: Dict) -> List[str]:
+    """Upstream endpoints a tool result is built from, including those behind the player / fixture indexes"""
+    if name in ("get_player_info", "compare_players"):
+        return [f"/competitions/{code}/{resource}" for code in TEAM_LEAGUES for resource in ("teams", "scorers?limit=50")]
+    if name in ("get_matches_by_day", "get_weekly_schedule"):
+        return fixture_endpoints()
+    return tool_endpoints(name, args)
+
+
+def materialize_token(name: str, args: Dict) -> Optional[tuple]:
+    """Freshness of the data a tool result depends on; None while any of it needs refetching
+
+    Upstream changes are tracked per call by the materializer (see
+    data_endpoints). The index load time covers player / fixture results and
+    the hour covers results that depend on the clock ("today", 7-day windows).
+    """
+    if any(get_cached(endpoint) is None for endpoint in tool_endpoints(name, args)):
+        return None
+    if name in ("get_player_info", "compare_players"):
+        loaded = player_index.updated
+    elif name in ("get_matches_by_day", "get_weekly_schedule"):
+        loaded = fixture_index.updated
+    else:
+        loaded = None
+    return (loaded, datetime.utcnow().strftime("%Y-%m-%d %H"))
+
+
+def tool_lane(name: str, args: Dict) -> int:
+    """Admission lane: calls served entirely from cache go ahead of upstream fetches"""
+    if all(get_cached(endpoint) is not None for endpoint in tool_endpoints(name, args)):
+        return LANE_CACHED
+    return LANE_UPSTREAM
+
+
 async def execute_tool(name: str, args: Dict) -> str:
     """Execute tool logic with actual API calls"""
     
     if name == "get_recent_matches":
         league = args.get("league", "")
-        league_code = LEAGUE_CODES.get(league)
-        
-        if not league_code:
-            return f"❌ League '{league}' not supported. Available: {', '.join(LEAGUE_CODES.keys())}"
-        
-        # Get matches from last 7 days
-        date_from = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d")
-        date_to = datetime.utcnow().strftime("%Y-%m-%d")
-        
-        data = await fetch_api(f"/competitions/{league_code}/matches?dateFrom={date_from}&dateTo={date_to}")
-        
-        if "error" in data:
-            return f"❌ {data['error']}"
-        
-        matches = data.get("matches", [])
-        if not matches:
-            return f"No matches found for {league} in the last 7 days"
-        
-        # Filter finished matches
-        finished = [m for m in matches if m.get("status") == "FINISHED"]
-        
-        if not finished:
-            return f"No finished matches for {league} in the last 7 days"
-        
-        lines = [f"⚽ Recent {league} Results (Last 7 Days)\n"]
-        for match in finished[-10:]:  # Last 10 matches
-            lines.append(format_match(match))
-        
-        return "\n".join(lines)
+        since, note = since_version(args.get("since"))
+        result = await recent_results(league, since)
+        return with_cursor(result, recent_matches_endpoint(LEAGUE_CODES.get(league, "")), note)
+    
+    elif name == "get_matchday_digest":
+        leagues, unknown = digest_leagues(args.get("leagues"))
+        if unknown:
+            return f"❌ League '{unknown[0]}' not supported. Available: {', '.join(LEAGUE_CODES.keys())}"
+        return "\n\n".join([section async for section in matchday_digest(leagues)])
     
     elif name == "get_upcoming_matches":
         league = args.get("league", "")
@@ -244,23 +565,30 @@ async def execute_tool(name: str, args: Dict) -> str:
             return f"❌ League '{league}' not supported"
         
         # Get matches for next 7 days
-        date_from = datetime.utcnow().strftime("%Y-%m-%d")
-        date_to = (datetime.utcnow() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        data = await fetch_api(f"/competitions/{league_code}/matches?dateFrom={date_from}&dateTo={date_to}")
+        since, note = since_version(args.get("since"))
+        endpoint = upcoming_matches_endpoint(league_code)
+        data = await fetch_api(endpoint)
         
         if "error" in data:
             return f"❌ {data['error']}"
         
         matches = data.get("matches", [])
         if not matches:
-            return f"No upcoming matches for {league} in the next 7 days"
+            return with_cursor(f"No upcoming matches for {league} in the next 7 days", endpoint, note)
+        
+        if since is not None:
+            changed = [m for m in matches if change_log.match_version(endpoint, m) > since]
+            if not changed:
+                return with_cursor(f"No {league} fixtures changed since the cursor", endpoint)
+            lines = [f"📅 {league} Fixtures Changed Since Cursor\n"]
+            lines.extend(format_match(match) for match in changed)
+            return with_cursor("\n".join(lines), endpoint)
         
         lines = [f"📅 Upcoming {league} Fixtures (Next 7 Days)\n"]
         for match in matches[:15]:  # Next 15 matches
             lines.append(format_match(match))
         
-        return "\n".join(lines)
+        return with_cursor("\n".join(lines), endpoint, note)
     
     elif name == "get_league_standings":
         league = args.get("league", "")
@@ -269,15 +597,19 @@ async def execute_tool(name: str, args: Dict) -> str:
         if not league_code:
             return f"❌ League '{league}' not supported"
         
-        data = await fetch_api(f"/competitions/{league_code}/standings")
-        return format_standings(data)
+        since, note = since_version(args.get("since"))
+        endpoint = f"/competitions/{league_code}/standings"
+        data = await fetch_api(endpoint)
+        if "error" in data:
+            return f"❌ {data['error']}"
+        return with_cursor(format_standings(data, endpoint, since), endpoint, note)
     
     elif name == "get_team_info":
         team_name = args.get("team_name", "")
         
         # Search across all competitions
         all_teams = []
-        for league_code in ["PL", "PD", "BL1", "SA", "FL1"]:
+        for league_code in TEAM_LEAGUES:
             data = await fetch_api(f"/competitions/{league_code}/teams")
             if "teams" in data:
                 all_teams.extend(data["teams"])
@@ -300,6 +632,7 @@ async def execute_tool(name: str, args: Dict) -> str:
             f"Stadium: {team.get('venue', '-')}",
             f"Website: {team.get('website', '-')}",
             f"Colors: {team.get('clubColors', '-')}",
+            f"Squad: {len(team.get('squad') or [])} players",
         ]
         
         return "\n".join(lines)
@@ -309,7 +642,7 @@ async def execute_tool(name: str, args: Dict) -> str:
         
         # Search across all competitions
         all_teams = []
-        for league_code in ["PL", "PD", "BL1", "SA", "FL1"]:
+        for league_code in TEAM_LEAGUES:
             data = await fetch_api(f"/competitions/{league_code}/teams")
             if "teams" in data:
                 all_teams.extend(data["teams"])
@@ -326,23 +659,213 @@ async def execute_tool(name: str, args: Dict) -> str:
         
         return "\n".join(lines)
     
+    elif name == "get_player_info":
+        player_name = args.get("player_name", "")
+        
+        error = await player_index.ensure_loaded()
+        if error:
+            return f"❌ {error}"
+        
+        player = player_index.find(player_name)
+        if not player:
+            return f"❌ Player '{player_name}' not found"
+        
+        return format_player(player_index, player)
+    
+    elif name == "compare_players":
+        error = await player_index.ensure_loaded()
+        if error:
+            return f"❌ {error}"
+        
+        players = []
+        for key in ("player1", "player2"):
+            player = player_index.find(args.get(key, ""))
+            if not player:
+                return f"❌ Player '{args.get(key, '')}' not found"
+            players.append(player)
+        
+        return format_comparison(player_index, *players)
+    
+    elif name == "get_matches_by_day":
+        return await schedule_view(args, "date", 1)
+    
+    elif name == "get_weekly_schedule":
+        try:
+            days = min(7, max(1, int(args.get("days", 7))))
+        except (TypeError, ValueError):
+            days = 7
+        return await schedule_view(args, "start", days)
+    
     return f"Unknown tool: {name}"
 
 
+def stream_text_result(request_id: Any, sections: AsyncIterator[str]) -> StreamingResponse:
+    """Stream a tools/call text result section by section (chunked transfer)
+
+    The body is a single JSON-RPC response; the text value is written
+    incrementally so clients receive each section as soon as it is ready.
+    """
+    head = json.dumps({"jsonrpc": "2.0", "id": request_id}, ensure_ascii=False)[:-1]
+
+    async def body():
+        yield head + ', "result": {"content": [{"type": "text", "text": "'
+        separator = ""
+        async for section in sections:
+            yield json.dumps(separator + section, ensure_ascii=False)[1:-1]
+            separator = "\n\n"
+        yield '"}], "isError": false}}'
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+@app.on_event("startup")
+async def start_background_refresh():
+    """Reload the player index in the background once the first lookup has loaded it"""
+    app.state.player_refresh = asyncio.create_task(player_index.refresh_forever(PLAYER_REFRESH))
+
+
+async def build_result(name: str, args: Dict) -> Optional[tuple]:
+    """Result and ETag for a tool call, or None for errors (never materialized)"""
+    result_text = await execute_tool(name, args)
+    if result_text.startswith("❌"):
+        return None
+    result = {"content": [{"type": "text", "text": result_text}], "isError": False}
+    return result, result_etag(result)
+
+
+@app.on_event("startup")
+async def start_materializer():
+    """Rebuild popular results right after their upstream data changes"""
+    app.state.materializer = asyncio.create_task(
+        materialized.run(build_result, materialize_token)
+    )
+
+
+@app.on_event("startup")
+async def start_loop_lag_monitor():
+    """Sample event-loop lag for /admin/loop"""
+    app.state.loop_lag = asyncio.create_task(loop_lag.run())
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    """Cancel the tasks started at startup and wait for them to finish"""
+    tasks = [app.state.player_refresh, app.state.materializer, app.state.loop_lag]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def result_etag(result: Dict) -> str:
+    """Weak ETag over a JSON-RPC result (the id differs per request, the result does not)"""
+    body = json.dumps(result, ensure_ascii=False, sort_keys=True).encode()
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match lists etag (weak comparison)
+
+    '*' is ignored: it would turn a client's first call, or an error
+    result, into a 304 without a body.
+    """
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or etag[2:] in candidates
+
+
+def cacheable_result(request: Request, request_id: Any, result: Dict, cache_control: str, etag: Optional[str] = None) -> Response:
+    """JSON-RPC result with ETag/Cache-Control; 304 when the client already has it"""
+    etag = etag or result_etag(result)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse({"jsonrpc": "2.0", "id": request_id, "result": result}, headers=headers)
+
+
+def materialized_result(request: Request, request_id: Any, entry: Materialized) -> Response:
+    """A pre-rendered tools/call result: only the request id is spliced in"""
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if not_modified(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    
+    body = b'{"jsonrpc":"2.0","id":' + encode_result(request_id) + b',"result":' + entry.body + b"}"
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# tools/list never changes while the process runs
+TOOLS_RESULT = {"tools": TOOLS}
+TOOLS_ETAG = result_etag(TOOLS_RESULT)
+
+
 @app.get("/")
 async def health():
     """Health check endpoint"""
-    return {
+    return JSONResponse({
         "status": "healthy",
         "service": "Weekly Soccer MCP v4.0",
         "api": "Football-Data.org",
+        "admission": admission.stats(),
+        "upstream": upstream_breaker.stats(),
+        "materialized": materialized.stats(),
         "timestamp": datetime.utcnow().isoformat()
-    }
+    }, headers={"Cache-Control": "no-store"})
+
+
+def admin_denied(request: Request) -> Optional[Response]:
+    """None for a valid X-Admin-Token; otherwise 404 (admin disabled) or 401"""
+    if not ADMIN_TOKEN:
+        return JSONResponse({"error": "Not found"}, status_code=404)
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        return JSONResponse({"error": "Unauthorized"}, status_code=401)
+    return None
+
+
+@app.post("/admin/profile")
+async def admin_profile(request: Request, seconds: float = 10.0, mode: str = "cprofile", format: str = "pstats"):
+    """Profile the running server for `seconds` and download the capture"""
+    denied = admin_denied(request)
+    if denied:
+        return denied
+    try:
+        payload, extension = await profiler.capture(seconds, mode, text=format == "text")
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    except RuntimeError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    
+    filename = f"weekly-soccer-{mode}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{extension}"
+    media_type = "text/plain; charset=utf-8" if extension == "txt" else "application/octet-stream"
+    return Response(payload, media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+    })
+
+
+@app.get("/admin/traces")
+async def admin_traces(request: Request):
+    """Span timings of recent requests over MCP_SLOW_REQUEST_MS"""
+    return admin_denied(request) or JSONResponse(slow_requests.stats(), headers={"Cache-Control": "no-store"})
+
+
+@app.get("/admin/loop")
+async def admin_loop(request: Request):
+    """Event-loop lag statistics"""
+    return admin_denied(request) or JSONResponse(loop_lag.stats(), headers={"Cache-Control": "no-store"})
+
+
+@app.get("/admin/materialized")
+async def admin_materialized(request: Request):
+    """Materialized-result stats with the hottest calls"""
+    return admin_denied(request) or JSONResponse(materialized.stats(top=True), headers={"Cache-Control": "no-store"})
 
 
 @app.post("/mcp")
-async def mcp_endpoint(req: MCPRequest):
+async def mcp_endpoint(req: MCPRequest, request: Request):
     """Main MCP endpoint"""
+    set_trace_name(req.method)
     try:
         if req.method == "initialize":
             return JSONResponse({
@@ -359,26 +882,38 @@ async def mcp_endpoint(req: MCPRequest):
             })
         
         elif req.method == "tools/list":
-            return JSONResponse({
-                "jsonrpc": "2.0",
-                "id": req.id,
-                "result": {"tools": TOOLS},
-            })
+            return cacheable_result(request, req.id, TOOLS_RESULT, "public, max-age=3600", TOOLS_ETAG)
         
         elif req.method == "tools/call":
             tool_name = req.params.get("name")
             tool_args = req.params.get("arguments", {})
+            set_trace_name(f"tools/call {tool_name}")
             
-            result_text = await execute_tool(tool_name, tool_args)
+            # The digest streams each league's section as it completes
+            if tool_name == "get_matchday_digest":
+                leagues, unknown = digest_leagues(tool_args.get("leagues"))
+                if not unknown:
+                    return stream_text_result(req.id, matchday_digest(leagues))
             
-            return JSONResponse({
-                "jsonrpc": "2.0",
-                "id": req.id,
-                "result": {
-                    "content": [{"type": "text", "text": result_text}],
-                    "isError": False,
-                },
-            })
+            key = call_key(tool_name, tool_args)
+            materialized.record(key, tool_name, tool_args, data_endpoints(tool_name, tool_args))
+            entry = materialized.get(key, materialize_token(tool_name, tool_args))
+            if entry is not None:
+                return materialized_result(request, req.id, entry)
+            
+            # Taken before executing: a change that lands mid-call must not be credited to this result
+            version = materialized.version(key)
+            start = time.perf_counter()
+            with span("execute"):
+                result_text = await execute_tool(tool_name, tool_args)
+            result = {"content": [{"type": "text", "text": result_text}], "isError": False}
+            etag = result_etag(result)
+            if not result_text.startswith("❌"):
+                materialized.store(key, result, etag, materialize_token(tool_name, tool_args), version,
+                                   time.perf_counter() - start)
+            
+            # Results change with upstream data: clients may keep them but must revalidate
+            return cacheable_result(request, req.id, result, "private, no-cache", etag)
         
         else:
             return JSONResponse({
@@ -5,15 +5,14 @@
 """
 
 import asyncio
+import json
+import os
 import sys
-from typing import Any
-from mcp.server.models import InitializationOptions
-from mcp.server import NotificationOptions, Server
-import mcp.server.stdio
-import mcp.types as types
+from datetime import date
 
-# 서버 인스턴스 생성
-server = Server("weekly-soccer-mcp")
+# mcp 패키지(+ players/football_api)는 import에 ~0.5초가 걸립니다.
+# main()은 이를 별도 스레드에서 로드하는 동안 initialize / tools/list에
+# 미리 만들어 둔 TOOL_SPECS로 바로 응답합니다 (serve_stdio 참고).
 
 # 지원 리그 목록
 SUPPORTED_LEAGUES = [
@@ -59,176 +58,218 @@ def normalize_league_name(league: str) -> str:
     else:
         return league
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    """사용 가능한 도구 목록 반환"""
-    return [
-        types.Tool(
-            name="get_recent_matches",
-            description="지난 7일간의 특정 리그 경기 결과를 웹 검색으로 조회합니다. 날짜, 팀명, 스코어, 주요 이벤트를 포함합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "league": {
-                        "type": "string",
-                        "description": f"리그명 (지원: {', '.join(SUPPORTED_LEAGUES[:8])})"
-                    },
-                    "team": {
-                        "type": "string",
-                        "description": "(선택) 특정 팀으로 필터링"
-                    }
+# 도구 설명에 들어가는 리그 목록
+LEAGUE_HINT = ", ".join(SUPPORTED_LEAGUES[:8])
+
+def current_season() -> str:
+    """현재 시즌 (예: 2025-26). 유럽 리그 기준으로 7월에 새 시즌 시작"""
+    today = date.today()
+    start = today.year if today.month >= 7 else today.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+def is_current_season(season: str) -> bool:
+    """'2025-26', '2025/26', '2025-2026' 형식 모두 현재 시즌으로 인정"""
+    start, _, end = season.strip().replace("/", "-").partition("-")
+    current = current_season()
+    return start == current[:4] and end in (current[5:], str(int(current[:4]) + 1))
+
+# 선수 인덱스 갱신 주기 (초)
+PLAYER_REFRESH = float(os.environ.get("PLAYER_REFRESH", 3600))
+
+# 프로파일링: 느린 요청 기준(ms), SIGUSR1 프로파일 캡처 시간(초), 결과 파일 저장 위치
+SLOW_REQUEST_MS = float(os.environ.get("MCP_SLOW_REQUEST_MS", 1000))
+PROFILE_SECONDS = float(os.environ.get("MCP_PROFILE_SECONDS", 10))
+PROFILE_DIR = os.environ.get("MCP_PROFILE_DIR", "")
+
+# Football-Data.org API로 조회 가능한 리그 (정규화된 이름 -> API 리그명)
+API_LEAGUES = {
+    "프리미어리그": "Premier League",
+    "라리가": "La Liga",
+    "분데스리가": "Bundesliga",
+    "세리에A": "Serie A",
+    "Ligue 1": "Ligue 1",
+    "Champions League": "Champions League",
+    "Europa League": "Europa League",
+}
+
+# 도구 정의 (모듈 로드 시 한 번만 생성)
+TOOL_SPECS = [
+    dict(
+        name="get_recent_matches",
+        description="지난 7일간의 특정 리그 경기 결과를 웹 검색으로 조회합니다. 날짜, 팀명, 스코어, 주요 이벤트를 포함합니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "league": {
+                    "type": "string",
+                    "description": f"리그명 (지원: {LEAGUE_HINT})"
                 },
-                "required": ["league"]
-            }
-        ),
-        types.Tool(
-            name="get_upcoming_matches",
-            description="다음 7일간의 특정 리그 경기 일정을 웹 검색으로 조회합니다. 날짜, 시간, 대진 팀을 포함합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "league": {
-                        "type": "string",
-                        "description": f"리그명 (지원: {', '.join(SUPPORTED_LEAGUES[:8])})"
-                    },
-                    "team": {
-                        "type": "string",
-                        "description": "(선택) 특정 팀으로 필터링"
-                    }
+                "team": {
+                    "type": "string",
+                    "description": "(선택) 특정 팀으로 필터링"
+                }
+            },
+            "required": ["league"]
+        }
+    ),
+    dict(
+        name="get_upcoming_matches",
+        description="다음 7일간의 특정 리그 경기 일정을 웹 검색으로 조회합니다. 날짜, 시간, 대진 팀을 포함합니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "league": {
+                    "type": "string",
+                    "description": f"리그명 (지원: {LEAGUE_HINT})"
                 },
-                "required": ["league"]
-            }
-        ),
-        types.Tool(
-            name="get_player_info",
-            description="선수의 상세 정보를 웹 검색으로 조회합니다. 소속팀, 포지션, 통계, 경력, 수상 이력, 연봉 등을 포함합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "player_name": {
-                        "type": "string",
-                        "description": "선수 이름 (예: 손흥민, Haaland, Mbappe)"
-                    }
+                "team": {
+                    "type": "string",
+                    "description": "(선택) 특정 팀으로 필터링"
+                }
+            },
+            "required": ["league"]
+        }
+    ),
+    dict(
+        name="get_player_info",
+        description="선수의 상세 정보를 조회합니다. 5대 리그 선수는 스쿼드/득점 데이터(소속팀, 포지션, 국적, 골, 어시스트)로 바로 답하고, 그 외에는 웹 검색으로 경력, 수상 이력, 연봉 등을 조회합니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "player_name": {
+                    "type": "string",
+                    "description": "선수 이름 (예: 손흥민, Haaland, Mbappe)"
+                }
+            },
+            "required": ["player_name"]
+        }
+    ),
+    dict(
+        name="get_league_standings",
+        description="특정 리그의 현재 순위표를 웹 검색으로 조회합니다. 순위, 팀명, 승점, 승/무/패, 득실차를 포함합니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "league": {
+                    "type": "string",
+                    "description": f"리그명 (지원: {LEAGUE_HINT})"
+                }
+            },
+            "required": ["league"]
+        }
+    ),
+    dict(
+        name="get_league_info",
+        description="리그의 역사와 정보를 웹 검색으로 조회합니다. 창설 연도, 참가 팀 수, 역대 우승팀, 특징을 포함합니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "league": {
+                    "type": "string",
+                    "description": f"리그명 (지원: {LEAGUE_HINT})"
+                }
+            },
+            "required": ["league"]
+        }
+    ),
+    dict(
+        name="get_team_info",
+        description="팀의 상세 정보를 웹 검색으로 조회합니다. 감독, 주요 선수, 홈 구장, 최근 성적, 이적 소식을 포함합니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "team_name": {
+                    "type": "string",
+                    "description": "팀 이름 (예: Manchester United, 토트넘, 인터밀란)"
                 },
-                "required": ["player_name"]
-            }
-        ),
-        types.Tool(
-            name="get_league_standings",
-            description="특정 리그의 현재 순위표를 웹 검색으로 조회합니다. 순위, 팀명, 승점, 승/무/패, 득실차를 포함합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "league": {
-                        "type": "string",
-                        "description": f"리그명 (지원: {', '.join(SUPPORTED_LEAGUES[:8])})"
-                    }
+                "league": {
+                    "type": "string",
+                    "description": "(선택) 소속 리그 (동명 팀 구분용)"
+                }
+            },
+            "required": ["team_name"]
+        }
+    ),
+    dict(
+        name="get_top_scorers",
+        description="특정 리그의 득점왕 순위를 웹 검색으로 조회합니다. 선수명, 소속팀, 골 수를 포함합니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "league": {
+                    "type": "string",
+                    "description": f"리그명 (지원: {LEAGUE_HINT})"
                 },
-                "required": ["league"]
-            }
-        ),
-        types.Tool(
-            name="get_league_info",
-            description="리그의 역사와 정보를 웹 검색으로 조회합니다. 창설 연도, 참가 팀 수, 역대 우승팀, 특징을 포함합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "league": {
-                        "type": "string",
-                        "description": f"리그명 (지원: {', '.join(SUPPORTED_LEAGUES[:8])})"
-                    }
+                "limit": {
+                    "type": "number",
+                    "description": "조회할 순위 수 (기본: 10)",
+                    "default": 10
+                }
+            },
+            "required": ["league"]
+        }
+    ),
+    dict(
+        name="compare_players",
+        description="두 선수의 통계를 비교합니다. 5대 리그 선수는 스쿼드/득점 데이터로 바로 비교하고, 그 외 선수나 특정 시즌은 웹 검색으로 조회하여 비교합니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "player1": {
+                    "type": "string",
+                    "description": "첫 번째 선수 이름"
                 },
-                "required": ["league"]
-            }
-        ),
-        types.Tool(
-            name="get_team_info",
-            description="팀의 상세 정보를 웹 검색으로 조회합니다. 감독, 주요 선수, 홈 구장, 최근 성적, 이적 소식을 포함합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "team_name": {
-                        "type": "string",
-                        "description": "팀 이름 (예: Manchester United, 토트넘, 인터밀란)"
-                    },
-                    "league": {
-                        "type": "string",
-                        "description": "(선택) 소속 리그 (동명 팀 구분용)"
-                    }
+                "player2": {
+                    "type": "string",
+                    "description": "두 번째 선수 이름"
                 },
-                "required": ["team_name"]
-            }
-        ),
-        types.Tool(
-            name="get_top_scorers",
-            description="특정 리그의 득점왕 순위를 웹 검색으로 조회합니다. 선수명, 소속팀, 골 수를 포함합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "league": {
-                        "type": "string",
-                        "description": f"리그명 (지원: {', '.join(SUPPORTED_LEAGUES[:8])})"
-                    },
-                    "limit": {
-                        "type": "number",
-                        "description": "조회할 순위 수 (기본: 10)",
-                        "default": 10
-                    }
+                "season": {
+                    "type": "string",
+                    "description": "(선택) 시즌, 예: 2024-25 (기본: 현재 시즌)"
+                }
+            },
+            "required": ["player1", "player2"]
+        }
+    ),
+    dict(
+        name="get_transfer_news",
+        description="최근 이적 소식을 웹 검색으로 조회합니다. 확정 이적, 이적 루머, 이적료 정보를 포함합니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "league": {
+                    "type": "string",
+                    "description": f"(선택) 특정 리그로 필터링 (지원: {LEAGUE_HINT})"
                 },
-                "required": ["league"]
-            }
-        ),
-        types.Tool(
-            name="compare_players",
-            description="두 선수의 통계를 비교합니다. 골, 어시스트, 평점 등을 웹 검색으로 조회하여 비교합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "player1": {
-                        "type": "string",
-                        "description": "첫 번째 선수 이름"
-                    },
-                    "player2": {
-                        "type": "string",
-                        "description": "두 번째 선수 이름"
-                    },
-                    "season": {
-                        "type": "string",
-                        "description": "(선택) 시즌 (기본: 현재 시즌)",
-                        "default": "2024-25"
-                    }
+                "team": {
+                    "type": "string",
+                    "description": "(선택) 특정 팀으로 필터링"
                 },
-                "required": ["player1", "player2"]
+                "player": {
+                    "type": "string",
+                    "description": "(선택) 특정 선수로 필터링"
+                }
             }
-        ),
-        types.Tool(
-            name="get_transfer_news",
-            description="최근 이적 소식을 웹 검색으로 조회합니다. 확정 이적, 이적 루머, 이적료 정보를 포함합니다.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "league": {
-                        "type": "string",
-                        "description": f"(선택) 특정 리그로 필터링 (지원: {', '.join(SUPPORTED_LEAGUES[:8])})"
-                    },
-                    "team": {
-                        "type": "string",
-                        "description": "(선택) 특정 팀으로 필터링"
-                    },
-                    "player": {
-                        "type": "string",
-                        "description": "(선택) 특정 선수로 필터링"
-                    }
+        }
+    ),
+    dict(
+        name="get_matchday_digest",
+        description="여러 리그의 최근 7일 경기 결과를 Football-Data.org API로 한 번에 조회합니다. 리그별 결과는 준비되는 대로 진행 알림(progress)으로 먼저 전달됩니다.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "leagues": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": f"(선택) 리그 목록 (지원: {', '.join(API_LEAGUES.values())}, 기본: 전체)"
                 }
             }
-        )
-    ]
-
-@server.call_tool()
-async def handle_call_tool(
-    name: str, arguments: dict | None
-) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-    """도구 호출 처리"""
+        }
+    )
+]
+
+def render_tool(name: str, arguments: dict | None) -> str:
+    """도구 호출 처리 (응답 텍스트 생성)"""
     
     if not arguments:
         arguments = {}
@@ -251,7 +292,7 @@ async def handle_call_tool(
 
 **검색 키워드**: `{league} 경기 결과 최근 7일 2024-25 시즌`
 """
-            return [types.TextContent(type="text", text=search_request)]
+            return search_request
         
         elif name == "get_upcoming_matches":
             league = normalize_league_name(arguments.get("league", ""))
@@ -270,7 +311,7 @@ async def handle_call_tool(
 
 **검색 키워드**: `{league} 경기 일정 다음 주 2024-25 시즌`
 """
-            return [types.TextContent(type="text", text=search_request)]
+            return search_request
         
         elif name == "get_player_info":
             player_name = arguments.get("player_name", "")
@@ -301,7 +342,7 @@ async def handle_call_tool(
 
 **검색 키워드**: `{player_name} 선수 프로필 소속팀 포지션 통계 경력 연봉 2024`
 """
-            return [types.TextContent(type="text", text=search_request)]
+            return search_request
         
         elif name == "get_league_standings":
             league = normalize_league_name(arguments.get("league", ""))
@@ -319,7 +360,7 @@ async def handle_call_tool(
 
 **검색 키워드**: `{league} 순위표 2024-25 시즌 현재`
 """
-            return [types.TextContent(type="text", text=search_request)]
+            return search_request
         
         elif name == "get_league_info":
             league = normalize_league_name(arguments.get("league", ""))
@@ -348,7 +389,7 @@ async def handle_call_tool(
 
 **검색 키워드**: `{league} 리그 정보 역사 우승팀 특징`
 """
-            return [types.TextContent(type="text", text=search_request)]
+            return search_request
         
         elif name == "get_team_info":
             team_name = arguments.get("team_name", "")
@@ -381,7 +422,7 @@ async def handle_call_tool(
 
 **검색 키워드**: `{team_name} 팀 정보 감독 주요선수 최근 성적 2024`
 """
-            return [types.TextContent(type="text", text=search_request)]
+            return search_request
         
         elif name == "get_top_scorers":
             league = normalize_league_name(arguments.get("league", ""))
@@ -399,12 +440,12 @@ async def handle_call_tool(
 
 **검색 키워드**: `{league} 득점왕 순위 2024-25 시즌 골 득점자`
 """
-            return [types.TextContent(type="text", text=search_request)]
+            return search_request
         
         elif name == "compare_players":
             player1 = arguments.get("player1", "")
             player2 = arguments.get("player2", "")
-            season = arguments.get("season", "2024-25")
+            season = arguments.get("season") or current_season()
             
             search_request = f"""🔍 **웹 검색 요청: {player1} vs {player2} 통계 비교**
 
@@ -433,7 +474,7 @@ async def handle_call_tool(
 
 **검색 키워드**: `{player1} vs {player2} 통계 비교 {season} 시즌`
 """
-            return [types.TextContent(type="text", text=search_request)]
+            return search_request
         
         elif name == "get_transfer_news":
             league = arguments.get("league")
@@ -479,36 +520,236 @@ async def handle_call_tool(
 
 **검색 키워드**: `{search_keywords} 2024 최근`
 """
-            return [types.TextContent(type="text", text=search_request)]
+            return search_request
         
         else:
-            return [types.TextContent(
-                type="text",
-                text=f"❌ 알 수 없는 도구: {name}"
-            )]
+            return f"❌ 알 수 없는 도구: {name}"
     
     except Exception as e:
-        return [types.TextContent(
-            type="text",
-            text=f"❌ 오류 발생: {str(e)}"
-        )]
+        return f"❌ 오류 발생: {str(e)}"
+
+async def player_answer(players, name: str, arguments: dict) -> str | None:
+    """선수 인덱스(스쿼드 + 득점 순위)로 응답. 찾지 못하면 None → 웹 검색 요청으로 대체"""
+    from players import format_comparison, format_player
+
+    # 지난 시즌 비교는 인덱스(현재 시즌)로 답할 수 없음
+    season = arguments.get("season") if name == "compare_players" else None
+    if season and not (isinstance(season, str) and is_current_season(season)):
+        return None
+    if await players.ensure_loaded():
+        return None
+
+    if name == "get_player_info":
+        player = players.find(arguments.get("player_name", ""))
+        return format_player(players, player) if player else None
+
+    first = players.find(arguments.get("player1", ""))
+    second = players.find(arguments.get("player2", ""))
+    if not first or not second:
+        return None
+    return format_comparison(players, first, second)
+
+async def matchday_digest(server, arguments: dict) -> str:
+    """여러 리그 결과를 동시에 조회하고, 리그별 결과를 완료 순서대로 progress 알림으로 전송"""
+    from football_api import LEAGUE_CODES, digest_leagues, matchday_digest as digest_sections
+
+    requested = arguments.get("leagues") or None
+    if isinstance(requested, str):
+        requested = [requested]
+    if requested:
+        requested = [API_LEAGUES.get(normalize_league_name(league), league) for league in requested]
+    leagues, unknown = digest_leagues(requested)
+    if unknown:
+        return f"❌ 지원하지 않는 리그: {unknown[0]} (지원: {', '.join(LEAGUE_CODES)})"
+
+    context = server.request_context
+    progress_token = context.meta.progressToken if context.meta else None
+
+    sections = []
+    async for section in digest_sections(leagues):
+        sections.append(section)
+        if progress_token is not None:
+            await context.session.send_progress_notification(
+                progress_token, len(sections), total=len(leagues), message=section
+            )
+    return "\n\n".join(sections)
+
+def create_server(slow_requests=None):
+    """MCP 서버 생성 및 핸들러 등록 (mcp 패키지는 여기서 처음 import)"""
+    from mcp.server import Server
+    import mcp.types as types
+    from players import PlayerIndex
+    from profiling import SlowRequestLog, span
+
+    if slow_requests is None:
+        slow_requests = SlowRequestLog(SLOW_REQUEST_MS / 1000)
+
+    server = Server("weekly-soccer-mcp")
+    tools = [types.Tool(**spec) for spec in TOOL_SPECS]
+    players = PlayerIndex()
+    background = set()
+
+    @server.list_tools()
+    async def handle_list_tools() -> list[types.Tool]:
+        """사용 가능한 도구 목록 반환"""
+        return tools
+
+    @server.call_tool()
+    async def handle_call_tool(
+        name: str, arguments: dict | None
+    ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+        """도구 호출 처리 (느린 호출은 구간별 소요 시간을 기록)"""
+        with slow_requests.request(f"tools/call {name}"), span("execute"):
+            return [types.TextContent(type="text", text=await call_tool(name, arguments))]
+
+    async def call_tool(name: str, arguments: dict | None) -> str:
+        if name == "get_matchday_digest":
+            return await matchday_digest(server, arguments or {})
+        if name in ("get_player_info", "compare_players"):
+            text = await player_answer(players, name, arguments or {})
+            # 첫 조회 이후에는 백그라운드에서 인덱스를 주기적으로 갱신
+            if players.updated and not background:
+                background.add(asyncio.create_task(players.refresh_forever(PLAYER_REFRESH)))
+            if text:
+                return text
+        return render_tool(name, arguments)
+
+    return server
+
+# mcp 로드 전에 직접 응답할 때 사용하는 값 (mcp가 보내는 initialize 응답과 동일해야 함)
+SERVER_INFO = {"name": "weekly-soccer-mcp", "version": "1.0.0"}
+SERVER_CAPABILITIES = {"experimental": {}, "tools": {"listChanged": False}}
+PROTOCOL_VERSIONS = ("2024-11-05", "2025-03-26")  # mcp.shared.version.SUPPORTED_PROTOCOL_VERSIONS
+
+def early_reply(message: dict) -> dict | None:
+    """mcp 로드 전에 답할 수 있는 요청(initialize, tools/list)의 응답. 그 외에는 None"""
+    method = message.get("method")
+    if method == "initialize":
+        requested = (message.get("params") or {}).get("protocolVersion")
+        result = {
+            "protocolVersion": requested if requested in PROTOCOL_VERSIONS else PROTOCOL_VERSIONS[-1],
+            "capabilities": SERVER_CAPABILITIES,
+            "serverInfo": SERVER_INFO,
+        }
+    elif method == "tools/list":
+        result = {"tools": TOOL_SPECS}
+    else:
+        return None
+    return {"jsonrpc": "2.0", "id": message.get("id"), "result": result}
+
+def load_server(slow_requests):
+    """mcp 패키지를 import 하고 서버와 초기화 옵션 생성 (별도 스레드에서 실행)"""
+    from mcp.server.models import InitializationOptions
+    from mcp.server import NotificationOptions
+
+    server = create_server(slow_requests)
+    options = InitializationOptions(
+        server_name=SERVER_INFO["name"],
+        server_version=SERVER_INFO["version"],
+        capabilities=server.get_capabilities(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={},
+        ),
+    )
+    return server, options
+
+async def serve_stdio(slow_requests):
+    """stdio 서버 실행
+
+    mcp 로드가 끝나기 전에 받은 메시지는 보관해 두고, initialize / tools/list는
+    early_reply()로 바로 응답합니다. 로드가 끝나면 보관한 메시지를 순서대로 mcp
+    세션에 전달하고, 이미 응답한 요청에 대한 mcp의 중복 응답은 버립니다.
+    """
+    loading = asyncio.ensure_future(asyncio.to_thread(load_server, slow_requests))
+    received = []  # mcp 로드 전에 받은 메시지 (원문)
+    answered = set()  # 이미 응답한 요청 id
+
+    def read_line():
+        return asyncio.ensure_future(asyncio.to_thread(sys.stdin.buffer.readline))
+
+    def write(line: str):
+        sys.stdout.buffer.write(line.encode() + b"\n")
+        sys.stdout.buffer.flush()
+
+    # 1단계: mcp 로드 중
+    reading = read_line()
+    while not loading.done():
+        done, _ = await asyncio.wait({loading, reading}, return_when=asyncio.FIRST_COMPLETED)
+        if reading not in done:
+            break
+        line = reading.result()
+        if not line:
+            break
+        received.append(line)
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = None
+        reply = early_reply(message) if isinstance(message, dict) and "id" in message else None
+        if reply and message["id"] not in answered:
+            answered.add(message["id"])
+            write(json.dumps(reply, ensure_ascii=False, separators=(",", ":")))
+        reading = read_line()
+    server, options = await loading
+
+    # 2단계: mcp 세션 (mcp.server.stdio.stdio_server와 같은 구조)
+    import anyio
+    import mcp.types as types
+    from mcp.shared.message import SessionMessage
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def stdin_reader():
+        nonlocal reading
+        async with read_stream_writer:
+            lines = list(received)
+            while True:
+                if lines:
+                    line = lines.pop(0)
+                else:
+                    line = await reading
+                    if not line:
+                        break
+                    reading = read_line()
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except Exception as exc:
+                    await read_stream_writer.send(exc)
+                    continue
+                await read_stream_writer.send(SessionMessage(message))
+
+    async def stdout_writer():
+        async with write_stream_reader:
+            async for session_message in write_stream_reader:
+                root = session_message.message.root
+                if isinstance(root, (types.JSONRPCResponse, types.JSONRPCError)) and root.id in answered:
+                    answered.discard(root.id)
+                    continue
+                write(session_message.message.model_dump_json(by_alias=True, exclude_none=True))
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(stdin_reader)
+        tg.start_soon(stdout_writer)
+        await server.run(read_stream, write_stream, options)
 
 async def main():
     """메인 실행 함수"""
-    # stdio 서버 실행
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="weekly-soccer-mcp",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
-                ),
-            ),
-        )
+    import tempfile
+    from profiling import LoopLagMonitor, Profiler, SlowRequestLog, install_signal_handlers
+
+    # 관리자 전용 프로파일링: 프로세스 소유자만 보낼 수 있는 시그널로 동작
+    # SIGUSR1 -> cProfile 캡처, SIGUSR2 -> 느린 요청 기록 + 이벤트 루프 지연 통계 (MCP_PROFILE_DIR에 파일로 저장)
+    slow_requests = SlowRequestLog(SLOW_REQUEST_MS / 1000)
+    loop_lag = LoopLagMonitor()
+    lag_task = asyncio.create_task(loop_lag.run())
+    install_signal_handlers(Profiler(), slow_requests, loop_lag, PROFILE_DIR or tempfile.gettempdir(), PROFILE_SECONDS)
+
+    # stdio 서버 실행 (종료 시 지연 모니터 태스크 정리)
+    try:
+        await serve_stdio(slow_requests)
+    finally:
+        lag_task.cancel()
 
 if __name__ == "__main__":
     asyncio.run(main())
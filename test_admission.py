@@ -0,0 +1,136 @@
+"""
+Admission control: malformed tools/call params, lane-ordered queueing and queue timeouts
+
+    pip install pytest && python -m pytest -q test_admission.py
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from admission import (
+    LANE_CACHED,
+    LANE_UPSTREAM,
+    AdmissionController,
+    AdmissionMiddleware,
+    ClientLimiter,
+    Overloaded,
+)
+
+
+def call(params) -> dict:
+    return {"jsonrpc": "2.0", "id": 7, "method": "tools/call", "params": params}
+
+
+@pytest.mark.parametrize("params", [
+    {"name": "get_recent_matches", "arguments": "Premier League"},
+    {"name": "get_recent_matches", "arguments": {"league": ["Premier League"]}},
+    {"name": "get_league_standings", "arguments": {"league": {"name": "La Liga"}}},
+])
+def test_malformed_arguments_get_a_jsonrpc_error(params):
+    response = TestClient(server.app).post("/mcp", json=call(params))
+    assert response.status_code == 200
+    assert response.json()["error"]["code"] == -32603
+
+
+@pytest.mark.parametrize("params", ["get_recent_matches", ["get_recent_matches"], 3])
+def test_non_dict_params_are_not_a_server_error(params):
+    response = TestClient(server.app).post("/mcp", json=call(params))
+    assert response.status_code < 500
+
+
+def run_middleware(classify, payload: dict) -> list:
+    """Send one POST /mcp through the middleware and return the lanes it admitted"""
+    lanes = []
+
+    class Recording(AdmissionController):
+        async def acquire(self, lane: int = LANE_UPSTREAM) -> None:
+            lanes.append(lane)
+            await super().acquire(lane)
+
+    async def app(scope, receive, send):
+        await receive()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    middleware = AdmissionMiddleware(
+        app, Recording(max_in_flight=1, max_queue=1, queue_timeout=1.0),
+        ClientLimiter(rate=100, burst=100), classify,
+    )
+    body = json.dumps(payload).encode()
+    scope = {"type": "http", "method": "POST", "path": "/mcp", "headers": [], "client": ("10.0.0.1", 1)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    assert sent[0]["status"] == 200
+    return lanes
+
+
+def test_classifier_errors_fall_back_to_upstream_lane():
+    def classify(name, args):
+        raise TypeError("unhashable type: 'list'")
+
+    assert run_middleware(classify, call({"name": "get_recent_matches"})) == [LANE_UPSTREAM]
+
+
+def test_classifier_sees_dict_arguments_only():
+    seen = []
+
+    def classify(name, args):
+        seen.append((name, args))
+        return LANE_CACHED
+
+    assert run_middleware(classify, call({"name": "search_team", "arguments": "Arsenal"})) == [LANE_CACHED]
+    assert run_middleware(classify, call("search_team")) == [LANE_CACHED]
+    assert seen == [("search_team", {}), (None, {})]
+
+
+def test_queue_serves_cached_lane_first():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=1.0)
+        await controller.acquire()
+        order = []
+
+        async def waiter(lane, label):
+            await controller.acquire(lane)
+            order.append(label)
+            controller.release()
+
+        tasks = [
+            asyncio.ensure_future(waiter(LANE_UPSTREAM, "upstream")),
+            asyncio.ensure_future(waiter(LANE_CACHED, "cached")),
+        ]
+        await asyncio.sleep(0)
+        assert controller.queued == 2
+        controller.release()
+        await asyncio.gather(*tasks)
+        return order, controller
+
+    order, controller = asyncio.run(scenario())
+    assert order == ["cached", "upstream"]
+    assert controller.in_flight == 0 and controller.queued == 0
+
+
+def test_full_queue_and_queue_timeout_are_rejected():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.05)
+        await controller.acquire()
+        waiting = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(Overloaded, match="saturated"):
+            await controller.acquire()
+        with pytest.raises(Overloaded, match="Timed out"):
+            await waiting
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.in_flight == 1 and controller.queued == 0
@@ -0,0 +1,39 @@
+"""
+ETag / If-None-Match on POST /mcp
+
+    pip install pytest && python -m pytest -q test_caching.py
+"""
+from fastapi.testclient import TestClient
+
+import server
+
+TOOLS_LIST = {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+UNKNOWN_LEAGUE = {
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/call",
+    "params": {"name": "get_recent_matches", "arguments": {"league": "Atlantis League"}},
+}
+
+
+def post(payload: dict, if_none_match: str = ""):
+    headers = {"If-None-Match": if_none_match} if if_none_match else {}
+    return TestClient(server.app).post("/mcp", json=payload, headers=headers)
+
+
+def test_matching_etag_is_not_modified():
+    etag = post(TOOLS_LIST).headers["etag"]
+    assert post(TOOLS_LIST, etag).status_code == 304
+    assert post(TOOLS_LIST, f'"other", {etag}').status_code == 304
+    assert post(TOOLS_LIST, etag[2:]).status_code == 304  # strong form of the weak tag
+    assert post(TOOLS_LIST, '"other"').status_code == 200
+
+
+def test_wildcard_never_hides_the_body():
+    response = post(TOOLS_LIST, "*")
+    assert response.status_code == 200
+    assert response.json()["result"]["tools"]
+
+    response = post(UNKNOWN_LEAGUE, "*")
+    assert response.status_code == 200
+    assert response.json()["result"]["content"][0]["text"].startswith("❌")
@@ -0,0 +1,96 @@
+"""
+since-cursors over overlapping endpoints, through the real fetch_api
+
+    pip install pytest && python -m pytest -q test_changes.py
+"""
+import asyncio
+import json
+import re
+
+import pytest
+
+import football_api
+import server
+from changes import ChangeLog
+from football_api import recent_matches_endpoint, upcoming_matches_endpoint
+from resilience import CircuitBreaker
+
+RECENT = recent_matches_endpoint("PL")
+UPCOMING = upcoming_matches_endpoint("PL")
+
+
+def match(home: int, away: int) -> dict:
+    return {
+        "id": 1,
+        "utcDate": "2025-10-18T14:00:00Z",
+        "status": "FINISHED",
+        "homeTeam": {"id": 1, "name": "Home FC"},
+        "awayTeam": {"id": 2, "name": "Away FC"},
+        "score": {"fullTime": {"home": home, "away": away}},
+    }
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Endpoint -> payload served by a stubbed transport; fetch_api itself is real"""
+    payloads = {}
+
+    async def hedged_get(endpoint):
+        return json.dumps(payloads[endpoint]).encode()
+
+    monkeypatch.setattr(football_api, "_hedged_get", hedged_get)
+    monkeypatch.setattr(football_api, "_api_cache", {})
+    monkeypatch.setattr(football_api, "upstream_breaker", CircuitBreaker())
+    monkeypatch.setattr(football_api, "change_log", ChangeLog())
+    monkeypatch.setattr(server, "change_log", football_api.change_log)
+    return payloads
+
+
+def expire(endpoint: str) -> None:
+    _, data = football_api._api_cache[endpoint]
+    football_api._api_cache[endpoint] = (float("-inf"), data)
+
+
+def call(name: str, since: str = "") -> str:
+    args = {"league": "Premier League", **({"since": since} if since else {})}
+    return asyncio.run(server.execute_tool(name, args))
+
+
+def cursor(text: str) -> str:
+    return re.search(r"Cursor: (\S+)", text).group(1)
+
+
+def test_goal_seen_first_by_another_endpoint_is_not_lost(upstream):
+    upstream[RECENT] = {"matches": [match(0, 0)]}
+    first = call("get_recent_matches")
+    assert "0 - 0" in first
+
+    # The upcoming window (same match) refetches first and sees the goal
+    upstream[UPCOMING] = upstream[RECENT] = {"matches": [match(1, 0)]}
+    assert "1 - 0" in call("get_upcoming_matches")
+
+    # The recent endpoint still serves its cached 0-0: nothing changed there yet
+    unchanged = call("get_recent_matches", cursor(first))
+    assert "No Premier League results changed" in unchanged
+    assert cursor(unchanged) == cursor(first)
+
+    expire(RECENT)
+    changed = call("get_recent_matches", cursor(first))
+    assert "Changed Since Cursor" in changed and "1 - 0" in changed
+    assert "No Premier League results changed" in call("get_recent_matches", cursor(changed))
+
+
+def test_cursor_ignores_changes_at_other_endpoints(upstream):
+    upstream[RECENT] = {"matches": [match(2, 1)]}
+    before = cursor(call("get_recent_matches"))
+    upstream[UPCOMING] = {"matches": [match(3, 1)]}
+    call("get_upcoming_matches")
+    assert cursor(call("get_recent_matches")) == before
+
+
+@pytest.mark.parametrize("since", [5, ["x"], {"v": 1}, "garbage"])
+def test_unusable_cursor_returns_full_result(upstream, since):
+    upstream[RECENT] = {"matches": [match(2, 1)]}
+    text = asyncio.run(server.execute_tool("get_recent_matches", {"league": "Premier League", "since": since}))
+    assert text.startswith("⚠️ Unknown or expired cursor")
+    assert "Recent Premier League Results" in text
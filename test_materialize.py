@@ -0,0 +1,69 @@
+"""
+Materialized results: per-endpoint invalidation and builds racing data changes
+
+    pip install pytest && python -m pytest -q test_materialize.py
+"""
+import asyncio
+
+import pytest
+
+from materialize import Materializer, call_key
+
+PL = "/competitions/PL/standings"
+PD = "/competitions/PD/standings"
+TOKEN = ("fresh", "2025-10-18 14")
+
+
+def standings(league: str):
+    args = {"league": league}
+    return call_key("get_league_standings", args), "get_league_standings", args
+
+
+@pytest.fixture
+def hot():
+    """Materializer with Premier League and La Liga standings hot and materialized"""
+    materialized = Materializer(min_calls=1)
+    for league, endpoint in (("Premier League", PL), ("La Liga", PD)):
+        key, name, args = standings(league)
+        materialized.record(key, name, args, [endpoint])
+        materialized.store(key, {"text": league}, f'W/"{league}"', TOKEN, materialized.version(key), 0.01)
+    return materialized
+
+
+def test_change_invalidates_only_keys_reading_the_endpoint(hot):
+    pl, pd = standings("Premier League")[0], standings("La Liga")[0]
+    for _ in range(5):  # live Premier League scores on a match day
+        hot.notify(PL)
+    assert hot.get(pl, TOKEN) is None
+    assert hot.get(pd, TOKEN).etag == 'W/"La Liga"'
+
+    hot.notify("/competitions/SA/matches?dateFrom=2025-10-11&dateTo=2025-10-18")
+    assert hot.get(pd, TOKEN) is not None
+
+
+def test_change_during_build_leaves_result_out_of_date(hot):
+    key, _, _ = standings("Premier League")
+    version = hot.version(key)  # taken before executing
+    hot.notify(PL)  # a concurrent fetch sees new data mid-call
+    hot.store(key, {"text": "built from older data"}, 'W/"old"', TOKEN, version, 0.01)
+    assert hot.get(key, TOKEN) is None
+
+
+def test_refresh_rebuilds_only_changed_keys(hot):
+    built = []
+
+    async def build(name, args):
+        built.append(args["league"])
+        return {"text": "rebuilt"}, 'W/"rebuilt"'
+
+    hot.notify(PD)
+    asyncio.run(hot.refresh(build, lambda name, args: TOKEN))
+    assert built == ["La Liga"]
+    assert hot.get(standings("La Liga")[0], TOKEN).etag == 'W/"rebuilt"'
+    assert hot.get(standings("Premier League")[0], TOKEN).etag == 'W/"Premier League"'
+
+
+def test_token_mismatch_is_a_miss(hot):
+    key = standings("Premier League")[0]
+    assert hot.get(key, ("fresh", "2025-10-18 15")) is None
+    assert hot.get(key, None) is None
@@ -0,0 +1,77 @@
+"""
+Player name lookup: Korean and Latin spellings, and names that must not match anyone
+
+    pip install pytest && python -m pytest -q test_players.py
+"""
+import asyncio
+
+import pytest
+
+from ingest import Scorer, SquadMember
+from players import PlayerIndex
+from server_stdio import current_season, player_answer
+
+SQUADS = {
+    "PL": [
+        {"id": 65, "name": "Manchester City FC", "squad": [SquadMember(1, "Erling Haaland", "Offence", "Norway", "2000-07-21")]},
+        {"id": 73, "name": "Tottenham Hotspur FC", "squad": [SquadMember(2, "Son Heung-Min", "Offence", "Korea Republic", "1992-07-08")]},
+    ],
+    "BL1": [
+        {"id": 5, "name": "FC Bayern München", "squad": [
+            SquadMember(3, "Harry Kane", "Offence", "England", "1993-07-28"),
+            SquadMember(4, "Kim Min-Jae", "Defence", "Korea Republic", "1996-11-15"),
+        ]},
+        {"id": 12, "name": "SV Werder Bremen", "squad": [SquadMember(5, "Amos Pieper", "Defence", "Germany", "1998-01-17")]},
+    ],
+}
+SCORERS = {
+    "BL1": [Scorer(3, "Harry Kane", "Offence", "England", "1993-07-28", 5, "FC Bayern München", 12, 3, 2, 8)],
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = PlayerIndex()
+    index.load(SQUADS, SCORERS)
+    return index
+
+
+@pytest.mark.parametrize("query, player_id", [
+    ("손흥민", 2),
+    ("Son Heung-Min", 2),
+    ("김민재", 4),
+    ("홀란드", 1),
+    ("Haland", 1),   # close spelling
+    ("Holand", 1),   # same consonants and first letter
+    ("케인", 3),
+    ("kane", 3),
+    ("Pieper", 5),
+])
+def test_finds_indexed_players(index, query, player_id):
+    assert index.find(query).id == player_id
+
+
+@pytest.mark.parametrize("query", [
+    "메시",        # alias for a player outside the index
+    "Messi",       # skeleton 'ms' collides with 'amos'
+    "Salah",
+    "Mo",
+    "Kevin",
+    "Pedri",
+    "",
+])
+def test_unknown_names_do_not_match(index, query):
+    assert index.find(query) is None
+
+
+def test_stdio_answers_from_index_only_for_current_season(index):
+    def answer(name, arguments):
+        return asyncio.run(player_answer(index, name, arguments))
+
+    pair = {"player1": "Kane", "player2": "Haaland"}
+    assert "Harry Kane vs Erling Haaland" in answer("compare_players", pair)
+    assert "Harry Kane" in answer("compare_players", {**pair, "season": current_season()})
+    assert answer("compare_players", {**pair, "season": "2020-21"}) is None
+    # Unknown players fall back to the web-search request
+    assert answer("get_player_info", {"player_name": "메시"}) is None
+    assert answer("compare_players", {"player1": "Messi", "player2": "Kane"}) is None
@@ -0,0 +1,145 @@
+"""
+Circuit breaker, stale fallback and hedging against a fault-injecting local stub
+
+    pip install pytest && python -m pytest -q test_resilience.py
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+
+import football_api
+from resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, LatencyTracker
+
+ENDPOINT = "/competitions/PL/matches?dateFrom=2025-10-11&dateTo=2025-10-18"
+
+
+class FaultyUpstream:
+    """Football-Data.org stand-in: `fail` answers 503, `delays` holds per-request sleeps"""
+
+    def __init__(self):
+        self.fail = False
+        self.delays = []
+        self.hits = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        self.hits += 1
+        if self.delays:
+            await asyncio.sleep(self.delays.pop(0))
+        if self.fail:
+            status, body = 503, b'{"message": "unavailable"}'
+        else:
+            status, body = 200, json.dumps({"matches": [{
+                "id": 1,
+                "utcDate": "2025-10-18T14:00:00Z",
+                "status": "FINISHED",
+                "homeTeam": {"id": 1, "name": "Home FC"},
+                "awayTeam": {"id": 2, "name": "Away FC"},
+                "score": {"fullTime": {"home": 2, "away": 1}},
+            }]}).encode()
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    upstream = FaultyUpstream()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(upstream, log_level="error", lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield upstream, f"http://127.0.0.1:{sock.getsockname()[1]}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def upstream(stub_server, monkeypatch):
+    stub, base = stub_server
+    stub.fail, stub.delays, stub.hits = False, [], 0
+    monkeypatch.setattr(football_api, "API_BASE", base)
+    monkeypatch.setattr(football_api, "CACHE_TTL", 0.0)  # every call goes upstream
+    monkeypatch.setattr(football_api, "HEDGE_REQUESTS", False)
+    monkeypatch.setattr(football_api, "_api_cache", {})
+    monkeypatch.setattr(football_api, "upstream_latency", LatencyTracker())
+    monkeypatch.setattr(football_api, "upstream_breaker", CircuitBreaker(
+        window=4, min_calls=4, failure_threshold=0.5, reset_timeout=0.3, half_open_calls=2,
+    ))
+    return stub
+
+
+def fetch(endpoint: str = ENDPOINT) -> dict:
+    return asyncio.run(football_api.fetch_api(endpoint))
+
+
+def test_breaker_opens_half_opens_and_closes(upstream):
+    breaker = football_api.upstream_breaker
+    upstream.fail = True
+    for _ in range(4):
+        assert "error" in fetch()
+    assert breaker.state == OPEN
+
+    # Open: fail fast without touching the upstream
+    hits = upstream.hits
+    assert "unavailable" in fetch()["error"]
+    assert upstream.hits == hits
+
+    time.sleep(0.35)
+    upstream.fail = False
+    assert "matches" in fetch()
+    assert breaker.state == HALF_OPEN
+    assert "matches" in fetch()
+    assert breaker.state == CLOSED
+
+
+def test_failed_trial_reopens(upstream):
+    upstream.fail = True
+    for _ in range(4):
+        fetch()
+    time.sleep(0.35)
+    fetch()
+    assert football_api.upstream_breaker.state == OPEN
+
+
+def test_stale_data_served_while_open(upstream):
+    fresh = fetch()
+    assert "matches" in fresh
+
+    upstream.fail = True
+    for _ in range(4):
+        assert fetch() == fresh  # upstream failures fall back to the cached copy
+    assert football_api.upstream_breaker.state == OPEN
+
+    hits = upstream.hits
+    assert fetch() == fresh
+    assert upstream.hits == hits
+
+
+def test_hedged_request_beats_slow_primary(upstream, monkeypatch):
+    monkeypatch.setattr(football_api, "HEDGE_REQUESTS", True)
+    tracker = LatencyTracker(min_samples=1)
+    tracker.add(0.05)
+    monkeypatch.setattr(football_api, "upstream_latency", tracker)
+
+    upstream.delays = [2.0]  # the primary stalls, the hedge answers at once
+    start = time.monotonic()
+    assert "matches" in fetch()
+    assert time.monotonic() - start < 1.0
+    assert upstream.hits == 2
+
+
+def test_no_hedge_without_latency_history(upstream, monkeypatch):
+    monkeypatch.setattr(football_api, "HEDGE_REQUESTS", True)
+    upstream.delays = [0.2]
+    assert "matches" in fetch()
+    assert upstream.hits == 1
@@ -0,0 +1,66 @@
+"""
+stdio server: early initialize / tools/list answers match mcp's and are not sent twice
+
+    pip install pytest && python -m pytest -q test_stdio.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def initialize(request_id: int, version: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "initialize",
+        "params": {"protocolVersion": version, "capabilities": {}, "clientInfo": {"name": "test", "version": "0"}},
+    }
+
+
+def exchange(version: str) -> list:
+    """Early handshake, then a tool call and a tools/list served by mcp; all responses in order"""
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "server_stdio.py")],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=HERE,
+    )
+
+    def send(message: dict) -> None:
+        proc.stdin.write((json.dumps(message) + "\n").encode())
+        proc.stdin.flush()
+
+    try:
+        send(initialize(1, version))
+        send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        send({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        send({"jsonrpc": "2.0", "id": 3, "method": "tools/call",
+              "params": {"name": "get_league_info", "arguments": {"league": "EPL"}}})
+        responses = [json.loads(proc.stdout.readline()) for _ in range(3)]
+        # id 3 is answered by mcp itself, so this tools/list is too
+        send({"jsonrpc": "2.0", "id": 4, "method": "tools/list"})
+        responses.append(json.loads(proc.stdout.readline()))
+        return responses
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=10)
+
+
+def test_early_answers_match_mcp_and_are_not_repeated():
+    responses = exchange("2024-11-05")
+    assert [response["id"] for response in responses] == [1, 2, 3, 4]
+    assert responses[0]["result"] == {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {"experimental": {}, "tools": {"listChanged": False}},
+        "serverInfo": {"name": "weekly-soccer-mcp", "version": "1.0.0"},
+    }
+    assert responses[1]["result"] == responses[3]["result"]
+    assert "리그 정보" in responses[2]["result"]["content"][0]["text"]
+
+
+def test_unsupported_protocol_version_gets_the_latest():
+    import mcp.types as types
+
+    responses = exchange("1999-01-01")
+    assert responses[0]["result"]["protocolVersion"] == types.LATEST_PROTOCOL_VERSION